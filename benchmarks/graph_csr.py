@@ -0,0 +1,102 @@
+"""
+Graph CSR Benchmark
+Compares the similarity graph stored as a dict of sets (the original
+layout), as the current dict of weighted dicts (``SongGraph.adj``) and as
+a frozen ``CSRGraph``: memory, neighbour-lookup throughput and BFS time.
+
+Usage:
+    python benchmarks/graph_csr.py [N]
+"""
+
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from music_player.models import Song
+from music_player.data_structures import SongGraph, CSRGraph
+
+
+def songs(n):
+    for i in range(n):
+        yield Song(f"S{i:07d}", f"Song title {i}", f"Artist {i % 1999}",
+                   f"Album {i % 4001}", str(1950 + i % 75), f"Genre {i % 200}")
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return kept, size
+
+
+def lookups_per_second(get_similar, ids, rounds=3):
+    start = time.perf_counter()
+    edges = 0
+    for _ in range(rounds):
+        for sid in ids:
+            edges += len(get_similar(sid))
+    elapsed = time.perf_counter() - start
+    return rounds * len(ids) / elapsed, edges
+
+
+def bfs_sets(adj, start):
+    seen = {start}
+    queue = deque([start])
+    while queue:
+        for sid in adj[queue.popleft()]:
+            if sid not in seen:
+                seen.add(sid)
+                queue.append(sid)
+    return len(seen)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    graph = SongGraph()
+    graph.add_songs(songs(n))
+    edges = sum(len(row) for row in graph.adj.values())
+    print(f"{n:,} songs, {edges:,} directed edges")
+
+    as_sets, sets_size = measure(lambda: {sid: set(row) for sid, row in graph.adj.items()})
+    as_dicts, dicts_size = measure(lambda: {sid: dict(row) for sid, row in graph.adj.items()})
+    csr, csr_size = measure(lambda: CSRGraph.from_graph(graph))
+    print("memory")
+    for label, size in [("dict of sets", sets_size),
+                        ("dict of weighted dicts", dicts_size),
+                        ("CSRGraph", csr_size)]:
+        print(f"  {label:<24} {size / 2**20:8.1f} MiB  ({size / max(edges, 1):5.1f} B/edge)")
+
+    ids = random.Random(1).sample(list(graph.songs), min(n, 2000))
+    print("get_similar lookups")
+    for label, get_similar in [("dict of sets", lambda sid: list(as_sets[sid])),
+                               ("dict of weighted dicts", lambda sid: list(as_dicts[sid])),
+                               ("CSRGraph", csr.get_similar),
+                               ("CSRGraph, node numbers", None)]:
+        if get_similar is None:
+            numbers = [csr.index[sid] for sid in ids]
+            rate, _ = lookups_per_second(csr.neighbor_indices, numbers)
+            print(f"  {label:<24} {rate:10,.0f} lookups/s")
+            continue
+        rate, _ = lookups_per_second(get_similar, ids)
+        print(f"  {label:<24} {rate:10,.0f} lookups/s")
+
+    print("full BFS")
+    start = time.perf_counter()
+    reached = bfs_sets(as_sets, ids[0])
+    print(f"  {'dict of sets':<24} {time.perf_counter() - start:8.3f} s  ({reached:,} songs)")
+    start = time.perf_counter()
+    reached = sum(1 for _ in csr.bfs(ids[0]))
+    print(f"  {'CSRGraph':<24} {time.perf_counter() - start:8.3f} s  ({reached:,} songs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Recommender Latency Benchmark
+Measures how long VectorRecommender takes to find the K most similar
+songs in a library of N songs, for one seed and for a batch of seeds.
+Requires NumPy.
+
+Usage:
+    python benchmarks/recommender_latency.py [N]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from music_player.models import Song
+from music_player.recommender import VectorRecommender
+
+
+def songs(n):
+    for i in range(n):
+        yield Song(f"S{i:07d}", f"Song title {i}", f"Artist {i % 30000}",
+                   f"Album {i % 100000}", str(1950 + i % 75), f"Genre {i % 50}")
+
+
+def median_ms(query, runs=20):
+    query()  # warm-up
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        query()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    engine = VectorRecommender()
+    start = time.perf_counter()
+    engine.add_songs(songs(n))
+    print(f"{n:,} songs, built in {time.perf_counter() - start:.1f} s")
+
+    seed = "S0000042"
+    batch = [f"S{i:07d}" for i in range(0, 8 * 9973, 9973)]
+    print(f"  similar(k=10)              {median_ms(lambda: engine.similar(seed, 10)):8.2f} ms")
+    print(f"  similar_batch(8 seeds)     {median_ms(lambda: engine.similar_batch(batch, 10)):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Song Memory Benchmark
+Measures the memory of a library of N songs stored as the original
+dict-backed objects, as slotted (dictionary-encoded) objects, and in the
+columnar store.
+
+Usage:
+    python benchmarks/song_memory.py [N]
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from music_player.models import Song, ARTISTS, ALBUMS, GENRES
+from music_player.data_structures import SLLNode, ColumnarSongStore
+
+
+class LegacySong:
+    """Song as it was before __slots__ (per-instance __dict__)."""
+
+    def __init__(self, song_id, title, artist, album, year, genre):
+        self.id = song_id
+        self.title = title
+        self.artist = artist
+        self.album = album
+        self.year = year
+        self.genre = genre
+
+
+class LegacySLLNode:
+    """SLLNode as it was before __slots__."""
+
+    def __init__(self, song):
+        self.song = song
+        self.next = None
+
+
+def rows(n):
+    """Yield song fields the way a CSV import would: fresh strings per row."""
+    for i in range(n):
+        yield (f"S{i:07d}", f"Song title {i}", f"Artist {i % 30000}",
+               f"Album {i % 100000}", str(1950 + i % 75), f"Genre {i % 50}")
+
+
+def measure(build, n):
+    # Start every layout from empty value dictionaries so each one pays for
+    # its own distinct artist/album/genre strings
+    for dictionary in (ARTISTS, ALBUMS, GENRES):
+        dictionary.codes.clear()
+        dictionary.values.clear()
+    gc.collect()
+    tracemalloc.start()
+    kept = build(n)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def legacy_library(n):
+    head = None
+    for fields in rows(n):
+        node = LegacySLLNode(LegacySong(*fields))
+        node.next = head
+        head = node
+    return head
+
+
+def slotted_library(n):
+    head = None
+    for fields in rows(n):
+        node = SLLNode(Song(*fields))
+        node.next = head
+        head = node
+    return head
+
+
+def columnar_store(n):
+    store = ColumnarSongStore()
+    for fields in rows(n):
+        store.append(Song(*fields))
+    return store
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{n:,} songs")
+    for label, build in [("dict-backed Song + SLLNode", legacy_library),
+                         ("__slots__ Song + SLLNode", slotted_library),
+                         ("ColumnarSongStore", columnar_store)]:
+        size = measure(build, n)
+        print(f"  {label:<28} {size / 2**20:8.1f} MiB  ({size / n:6.1f} B/song)")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,5 +11,5 @@ from music_player.gui import MusicPlayerGUI
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = MusicPlayerGUI(root)
+    app = MusicPlayerGUI(root, log_path="listening_log.tsv")
     root.mainloop()
@@ -3,32 +3,73 @@ Music Player Controller
 Contains the main controller logic for managing the music player.
 """
 
+import heapq
+from itertools import islice
+
 from .models import Song
+from .query import LibraryQuery
+from .listening_log import ListeningLog
+from .recommender import VectorRecommender
+from .radio import SongRadio
 from .data_structures import (
     SongLibrarySLL,
-    PlaylistDLL,
-    PlaybackHistoryStack,
+    PlaylistManager,
+    BoundedHistoryStack,
     UpNextQueue,
     ArtistMultiLinkedList,
     SongBST,
-    SongGraph
+    SongGraph,
+    FuzzySongIndex,
+    LibraryIndexes,
+    ShuffleOrder,
+    PlayStatistics
 )
 
 
+def _title_key(song: Song):
+    return song.title.lower()
+
+
 class MusicPlayerController:
-    """Controller for managing music player operations."""
+    """Controller for managing music player operations.
+
+    Pass ``implicit_similarity=True`` to keep the similarity graph as
+    artist/genre buckets instead of explicit edges (see ``SongGraph``).
+    ``history_capacity`` caps how many played songs the history keeps.
+    With ``log_path`` every play and stop is also appended to a persisted
+    ``ListeningLog``; call ``close()`` on exit to write out the last events.
+    ``vector_recommendations=True`` answers ``recommend`` and ``play_next``
+    with the NumPy ``VectorRecommender`` instead of the graph (NumPy needed).
+    """
     
-    def __init__(self):
+    RECOMMEND_DEPTH = 10    # recommendations considered by play_next
+    RECENT_SKIP = 10        # recently played songs play_next avoids repeating
+    RADIO_SEEDS = 5         # history songs that seed the radio besides the current one
+
+    def __init__(self, implicit_similarity=False, history_capacity=1000, log_path=None,
+                 vector_recommendations=False):
         self.library = SongLibrarySLL()
-        self.playlist = PlaylistDLL()
-        self.history = PlaybackHistoryStack()
+        self.playlists = PlaylistManager()
+        self.playlist = self.playlists.create("Default Playlist")
+        self.history = BoundedHistoryStack(history_capacity)
         self.up_next = UpNextQueue()
         self.artists = ArtistMultiLinkedList()
         self.search_tree = SongBST()
-        self.graph = SongGraph()
+        self.graph = SongGraph(implicit=implicit_similarity)
+        self.fuzzy_index = FuzzySongIndex()
+        self.indexes = LibraryIndexes()
+        self.stats = PlayStatistics()
+        self.listening_log = ListeningLog(log_path) if log_path else None
+        self.vectors = VectorRecommender() if vector_recommendations else None
 
         self.current_song = None
         self.in_playlist_mode = False
+        self.shuffle = False
+        # Lazily drawn order over the library IDs while shuffle is on
+        self._library_shuffle = None
+        self._radio = None
+        # Generator of radio song IDs while radio mode is on
+        self._station = None
 
     # ----- Admin Functions -----
 
@@ -37,53 +78,91 @@ class MusicPlayerController:
         if self.library.find_by_id(song.id):
             raise ValueError("ID lagu sudah digunakan.")
         self.library.add_song(song)
-        self.artists.add_song(song)
-        self.search_tree.insert(song)
-        self.graph.add_song(song)
+        self._index_song(song)
+        if self._library_shuffle is not None:
+            self._library_shuffle.add(song.id)
+
+    def add_songs_bulk(self, songs):
+        """Add many songs at once, building the search indexes a single time.
 
-        # Create similarity edges (same artist or genre)
-        for s in self.library.to_list():
-            if s.id == song.id:
-                continue
-            if s.artist == song.artist or s.genre == song.genre:
-                self.graph.add_similarity(song, s)
+        All IDs are checked in one pass before anything is added, so a
+        duplicate leaves the library untouched. With the default explicit
+        similarity graph every same-artist/same-genre pair becomes an edge,
+        so a batch past ``SongGraph.MAX_BULK_EDGES`` edges is refused the
+        same way; large imports need ``implicit_similarity=True``.
+        """
+        songs = list(songs)
+        seen = set()
+        for song in songs:
+            if song.id in seen or song.id in self.library:
+                raise ValueError(f"ID lagu sudah digunakan: {song.id}")
+            seen.add(song.id)
+
+        # First, so an oversized explicit graph is refused before any other change
+        self.graph.add_songs(songs)
+        for song in songs:
+            self.library.add_song(song)
+            self.artists.add_song(song)
+        by_title = sorted(songs, key=_title_key)
+        self.search_tree.build_from_sorted(
+            heapq.merge(self.search_tree.inorder(), by_title, key=_title_key)
+        )
+        for song in songs:
+            self.fuzzy_index.add_song(song)
+        self.indexes.add_songs(songs)
+        if self.vectors is not None:
+            self.vectors.add_songs(songs)
+        if self._library_shuffle is not None:
+            for song in songs:
+                self._library_shuffle.add(song.id)
+        return len(songs)
 
     def update_song_in_library(self, song_id, new_song: Song):
         """Update an existing song in the library."""
         old_song = self.library.find_by_id(song_id)
         if not old_song:
             raise ValueError("Lagu tidak ditemukan.")
-        self.artists.remove_song(old_song)
-        self.graph = SongGraph()
-        self.search_tree = SongBST()
         self.library.update_song(song_id, new_song)
-        for s in self.library.to_list():
-            self.artists.add_song(s)
-            self.search_tree.insert(s)
-        songs = self.library.to_list()
-        for i in range(len(songs)):
-            for j in range(i + 1, len(songs)):
-                s1, s2 = songs[i], songs[j]
-                if s1.artist == s2.artist or s1.genre == s2.genre:
-                    self.graph.add_similarity(s1, s2)
+        self._unindex_song(old_song)
+        self._index_song(new_song)
+        if new_song.id != song_id:
+            self.stats.forget_song(song_id)
+            if self._library_shuffle is not None:
+                self._library_shuffle.remove(song_id)
+                self._library_shuffle.add(new_song.id)
 
     def delete_song_from_library(self, song_id):
         """Delete a song from the library."""
         song = self.library.delete_song(song_id)
         if not song:
             raise ValueError("Lagu tidak ditemukan.")
+        self._unindex_song(song)
+        self.playlists.remove_song_everywhere(song_id)
+        self.up_next.remove(song_id)
+        self.stats.forget_song(song_id)
+        if self._library_shuffle is not None:
+            self._library_shuffle.remove(song_id)
+
+    def _index_song(self, song: Song):
+        """Add a song to the artist list, BST, similarity graph and search indexes."""
+        self.artists.add_song(song)
+        self.search_tree.insert(song)
+        # Similarity edges (same artist or genre) come from the graph buckets
+        self.graph.link_similar(song)
+        self.fuzzy_index.add_song(song)
+        self.indexes.add_song(song)
+        if self.vectors is not None:
+            self.vectors.add_song(song)
+
+    def _unindex_song(self, song: Song):
+        """Remove a song from the artist list, BST, similarity graph and search indexes."""
         self.artists.remove_song(song)
-        self.playlist.remove(song_id)
-        self.search_tree = SongBST()
-        self.graph = SongGraph()
-        for s in self.library.to_list():
-            self.search_tree.insert(s)
-        songs = self.library.to_list()
-        for i in range(len(songs)):
-            for j in range(i + 1, len(songs)):
-                s1, s2 = songs[i], songs[j]
-                if s1.artist == s2.artist or s1.genre == s2.genre:
-                    self.graph.add_similarity(s1, s2)
+        self.search_tree.delete(song)
+        self.graph.remove_song(song)
+        self.fuzzy_index.remove_song(song)
+        self.indexes.remove_song(song)
+        if self.vectors is not None:
+            self.vectors.remove_song(song.id)
 
     # ----- User Functions -----
 
@@ -95,6 +174,64 @@ class MusicPlayerController:
         """Search for a song by title using BST."""
         return self.search_tree.search(title)
 
+    def search_songs_by_title(self, title):
+        """Return every song with the given title using BST."""
+        return self.search_tree.search_all(title)
+
+    def autocomplete_title(self, prefix, limit=10):
+        """Return up to ``limit`` songs whose title starts with ``prefix``, sorted by title."""
+        return list(islice(self.search_tree.iter_prefix(prefix), limit))
+
+    def fuzzy_search(self, query, limit=10):
+        """Search titles and artists with typo tolerance, best matches first."""
+        return self.fuzzy_index.search(query, limit)
+
+    def songs_by_artist(self, artist):
+        """Lazily iterate the songs of an artist."""
+        return self.artists.songs_by_artist(artist)
+
+    def songs_by_album(self, album):
+        """Lazily iterate the songs of an album."""
+        return self.indexes.by_album(album)
+
+    def songs_by_genre(self, genre):
+        """Lazily iterate the songs of a genre."""
+        return self.indexes.by_genre(genre)
+
+    def songs_by_year_range(self, low, high):
+        """Lazily iterate songs released between ``low`` and ``high`` (inclusive), by year."""
+        return self.indexes.by_year_range(low, high)
+
+    def query(self, **filters):
+        """Build a combined query, e.g. ``query(genre="rock", artist="X", year_min=2000)``.
+
+        Iterate the result for the matching songs; ``explain()`` reports the
+        index that was picked.
+        """
+        return LibraryQuery(self, **filters)
+
+    def create_playlist(self, name):
+        """Create a new named playlist."""
+        return self.playlists.create(name)
+
+    def delete_playlist(self, name):
+        """Delete a named playlist (the active one cannot be deleted)."""
+        if self.playlist is self.playlists.get(name):
+            raise ValueError("Playlist aktif tidak bisa dihapus.")
+        self.playlists.delete(name)
+
+    def select_playlist(self, name):
+        """Make a named playlist the active one."""
+        playlist = self.playlists.get(name)
+        if not playlist:
+            raise ValueError("Playlist tidak ditemukan.")
+        if playlist is not self.playlist:
+            self.playlist = playlist
+            self.in_playlist_mode = False
+            if self.shuffle != (playlist.shuffle is not None):
+                playlist.set_shuffle(self.shuffle)
+        return playlist
+
     def add_to_playlist(self, song_id):
         """Add a song to the playlist."""
         song = self.library.find_by_id(song_id)
@@ -107,6 +244,125 @@ class MusicPlayerController:
         if not self.playlist.remove(song_id):
             raise ValueError("Lagu tidak ada di playlist.")
 
+    def remove_from_playlist_at(self, index):
+        """Remove the playlist entry at ``index``."""
+        node = self.playlist.node_at(index)
+        if not node:
+            raise ValueError("Lagu tidak ada di playlist.")
+        return self.playlist.remove_node(node)
+
+    def move_in_playlist(self, index, new_index):
+        """Move the playlist entry at ``index`` to ``new_index``."""
+        try:
+            self.playlist.move_range(index, index + 1, new_index)
+        except IndexError as e:
+            raise ValueError(str(e))
+
+    def queue_song(self, song_id, play_next=False):
+        """Add a song to the up-next queue; ``play_next`` puts it ahead of the queued songs."""
+        song = self.library.find_by_id(song_id)
+        if not song:
+            raise ValueError("Lagu tidak ditemukan.")
+        priority = UpNextQueue.PLAY_NEXT if play_next else UpNextQueue.ADD
+        self.up_next.enqueue(song, priority)
+
+    def remove_from_queue(self, song_id):
+        """Remove every queued entry of a song from the up-next queue."""
+        if not self.up_next.remove(song_id):
+            raise ValueError("Lagu tidak ada di antrian.")
+
+    def peek_up_next(self):
+        """Return the song the queue will play next, without removing it."""
+        return self.up_next.peek()
+
+    def up_next_songs(self):
+        """Lazily iterate the queued songs in play order."""
+        return iter(self.up_next)
+
+    def set_shuffle(self, enabled):
+        """Turn shuffle mode on or off for the active playlist and the library.
+
+        The shuffled order is drawn one song at a time, so turning shuffle on
+        costs no up-front shuffle of the whole library.
+        """
+        self.shuffle = bool(enabled)
+        self.playlist.set_shuffle(self.shuffle)
+        if not self.shuffle:
+            self._library_shuffle = None
+            return
+        current = self.current_song
+        if current is None or current.id not in self.library or self.in_playlist_mode:
+            current = None
+        self._library_shuffle = ShuffleOrder(
+            self.library.song_ids(), current=current.id if current else None
+        )
+
+    def set_radio(self, enabled):
+        """Turn radio mode on or off (NumPy needed).
+
+        In radio mode ``play_next`` streams songs ranked by personalized
+        PageRank around the current song and recent history (see ``SongRadio``).
+        """
+        if not enabled:
+            self._station = None
+            return
+        if self._radio is None:
+            self._radio = SongRadio(self.graph)
+        self._station = self._radio.station(*self._radio_seeds())
+
+    @property
+    def radio(self):
+        """Whether radio mode is on."""
+        return self._station is not None
+
+    def _radio_seeds(self):
+        """Current song plus recent history, each older song weighing half as much."""
+        seeds = list(islice(self.history, self.RADIO_SEEDS))
+        if self.current_song:
+            seeds.insert(0, self.current_song)
+        return [song.id for song in seeds], [0.5 ** i for i in range(len(seeds))]
+
+    def _recent_ids(self):
+        """IDs of the current song and the last songs played."""
+        recent = {song.id for song in islice(self.history, self.RECENT_SKIP)}
+        if self.current_song:
+            recent.add(self.current_song.id)
+        return recent
+
+    def recent_history(self, limit=10):
+        """Return up to ``limit`` recently played songs, most recent first."""
+        return list(islice(self.history, limit))
+
+    def recommend(self, song_id, k=10):
+        """Return up to ``k`` songs most similar to ``song_id``, best first."""
+        return [self.library.find_by_id(sid) for sid, _ in self._recommendations(song_id, k)]
+
+    def recommend_batch(self, song_ids, k=10):
+        """Return the ``recommend`` list of every song in ``song_ids``."""
+        if self.vectors is not None:
+            batches = self.vectors.similar_batch(song_ids, k)
+        else:
+            batches = [self.graph.recommend(sid, k) for sid in song_ids]
+        return [[self.library.find_by_id(sid) for sid, _ in batch] for batch in batches]
+
+    def _recommendations(self, song_id, k):
+        """``(song_id, score)`` pairs from the vector engine if enabled, else the graph."""
+        if self.vectors is not None:
+            return self.vectors.similar(song_id, k)
+        return self.graph.recommend(song_id, k)
+
+    def top_songs(self, k=10):
+        """Return up to ``k`` ``(song, plays)`` pairs, most played this session first."""
+        return [(self.library.find_by_id(sid), n) for sid, n in self.stats.top_songs(k)]
+
+    def top_artists(self, k=10):
+        """Return up to ``k`` ``(artist, plays)`` pairs, most played first."""
+        return self.stats.top_artists(k)
+
+    def top_genres(self, k=10):
+        """Return up to ``k`` ``(genre, plays)`` pairs, most played first."""
+        return self.stats.top_genres(k)
+
     def play_song(self, song: Song, from_playlist=False):
         """Play a song."""
         if not song:
@@ -115,12 +371,28 @@ class MusicPlayerController:
             self.history.push(self.current_song)
         self.current_song = song
         self.in_playlist_mode = from_playlist
+        self.stats.record(song)
+        if self.listening_log is not None:
+            self.listening_log.log('play', song.id)
         return song
 
     def stop_song(self):
         """Stop the current song."""
+        if self.current_song and self.listening_log is not None:
+            self.listening_log.log('stop', self.current_song.id)
         self.current_song = None
 
+    def listening_history(self, start=None, end=None):
+        """Return logged ``(timestamp, event, song_id)`` records between ``start`` and ``end``."""
+        if self.listening_log is None:
+            return []
+        return self.listening_log.query(start, end)
+
+    def close(self):
+        """Flush and close the listening log, if any."""
+        if self.listening_log is not None:
+            self.listening_log.close()
+
     def play_next(self):
         """Play the next song."""
         if self.in_playlist_mode and self.playlist.current:
@@ -132,12 +404,32 @@ class MusicPlayerController:
             song = self.up_next.dequeue()
             return self.play_song(song, False)
 
+        if self._station is not None:
+            recent = self._recent_ids()
+            for _ in range(2):
+                for sid in self._station:
+                    song = self.library.find_by_id(sid)
+                    if song and sid not in recent:
+                        return self.play_song(song, False)
+                # The station ran dry: reseed it from what is playing now
+                self._station = self._radio.station(*self._radio_seeds())
+
+        if self._library_shuffle is not None:
+            sid = self._library_shuffle.next()
+            if sid is not None:
+                return self.play_song(self.library.find_by_id(sid), False)
+
         if self.current_song:
-            similar_ids = self.graph.get_similar(self.current_song.id)
-            for sid in similar_ids:
+            # Best-weighted neighbour that was not played just now
+            recent = self._recent_ids()
+            fallback = None
+            for sid, _ in self._recommendations(self.current_song.id, self.RECOMMEND_DEPTH):
                 s = self.library.find_by_id(sid)
-                if s:
+                if s and sid not in recent:
                     return self.play_song(s, False)
+                fallback = fallback or s
+            if fallback:
+                return self.play_song(fallback, False)
 
         songs = self.library.to_list()
         if songs:
@@ -150,6 +442,10 @@ class MusicPlayerController:
             prev_song = self.playlist.prev_song()
             if prev_song:
                 return self.play_song(prev_song, True)
+        if self._library_shuffle is not None and not self.in_playlist_mode:
+            sid = self._library_shuffle.prev()
+            if sid is not None:
+                return self.play_song(self.library.find_by_id(sid), False)
         prev = self.history.pop()
         if prev:
             return self.play_song(prev, False)
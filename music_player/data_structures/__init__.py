@@ -5,16 +5,29 @@ Contains implementations of various data structures used in the music player.
 
 from .linked_lists import SLLNode, SongLibrarySLL, DLLNode, PlaylistDLL
 from .linked_lists import ArtistSongNode, ArtistNode, ArtistMultiLinkedList
-from .stack_queue import StackNode, PlaybackHistoryStack, QueueNode, UpNextQueue
+from .stack_queue import StackNode, PlaybackHistoryStack, BoundedHistoryStack
+from .stack_queue import QueueNode, QueueLevel, UpNextQueue
 from .tree import TreeNode, SongBST
-from .graph import SongGraph
+from .graph import SongGraph, CSRGraph
+from .fuzzy import FuzzySongIndex
+from .columnar import ColumnarSongStore
+from .indexes import HashIndex, YearIndex, LibraryIndexes
+from .playlists import PlaylistManager
+from .shuffle import ShuffleOrder
+from .play_stats import CountBucket, PlayCounter, PlayStatistics
 
 __all__ = [
     'SLLNode', 'SongLibrarySLL',
     'DLLNode', 'PlaylistDLL',
     'ArtistSongNode', 'ArtistNode', 'ArtistMultiLinkedList',
-    'StackNode', 'PlaybackHistoryStack',
-    'QueueNode', 'UpNextQueue',
+    'StackNode', 'PlaybackHistoryStack', 'BoundedHistoryStack',
+    'QueueNode', 'QueueLevel', 'UpNextQueue',
     'TreeNode', 'SongBST',
-    'SongGraph'
+    'SongGraph', 'CSRGraph',
+    'FuzzySongIndex',
+    'ColumnarSongStore',
+    'HashIndex', 'YearIndex', 'LibraryIndexes',
+    'PlaylistManager',
+    'ShuffleOrder',
+    'CountBucket', 'PlayCounter', 'PlayStatistics'
 ]
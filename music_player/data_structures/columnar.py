@@ -0,0 +1,105 @@
+"""
+Columnar Song Store
+Contains a column-oriented store that keeps song fields in parallel arrays.
+"""
+
+from array import array
+
+from ..models import Song, ARTISTS, ALBUMS, GENRES
+
+
+# === SONG STORAGE - COLUMNAR (PARALLEL ARRAYS) ===
+
+class ColumnarSongStore:
+    """Stores songs as parallel per-field columns addressed by integer row.
+
+    Instead of one object per song, every field lives in its own column and
+    a song is just a row number. Artist, album and genre are kept as their
+    dictionary codes in compact ``array('i')`` columns; the year column has
+    its own pool of distinct values so each year string is stored once.
+
+    Rows of deleted songs are reused by later appends, so row numbers handed
+    out to other structures stay valid until that song is removed.
+    """
+
+    FIELDS = ('id', 'title', 'artist', 'album', 'year', 'genre')
+    ENCODED = {'artist': ARTISTS, 'album': ALBUMS, 'genre': GENRES}
+
+    def __init__(self):
+        self.columns = {
+            field: array('i') if field in self.ENCODED else []
+            for field in self.FIELDS
+        }
+        self._years = {}
+        self._rows = {}
+        self._free = []
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, song_id):
+        return song_id in self._rows
+
+    def row_of(self, song_id):
+        """Return the row holding ``song_id``, or ``None``."""
+        return self._rows.get(song_id)
+
+    def append(self, song: Song):
+        """Store a song and return its row."""
+        if song.id in self._rows:
+            raise ValueError("ID lagu sudah digunakan.")
+        values = self._encode(song)
+        if self._free:
+            row = self._free.pop()
+            for field, value in zip(self.FIELDS, values):
+                self.columns[field][row] = value
+        else:
+            row = len(self.columns['id'])
+            for field, value in zip(self.FIELDS, values):
+                self.columns[field].append(value)
+        self._rows[song.id] = row
+        return row
+
+    def update(self, song_id, new_song: Song):
+        """Overwrite the row of ``song_id`` with ``new_song``; return the row."""
+        if new_song.id != song_id and new_song.id in self._rows:
+            raise ValueError("ID lagu sudah digunakan.")
+        row = self._rows.pop(song_id, None)
+        if row is None:
+            return None
+        self._rows[new_song.id] = row
+        for field, value in zip(self.FIELDS, self._encode(new_song)):
+            self.columns[field][row] = value
+        return row
+
+    def remove(self, song_id):
+        """Remove a song and free its row; return the freed row or ``None``."""
+        row = self._rows.pop(song_id, None)
+        if row is None:
+            return None
+        for field, column in self.columns.items():
+            column[row] = -1 if field in self.ENCODED else None
+        self._free.append(row)
+        return row
+
+    def get(self, row):
+        """Materialize the song stored at ``row``."""
+        return Song(*(self.value(row, field) for field in self.FIELDS))
+
+    def value(self, row, field):
+        """Return a single (decoded) field of a row without building a ``Song``."""
+        value = self.columns[field][row]
+        dictionary = self.ENCODED.get(field)
+        return dictionary.decode(value) if dictionary else value
+
+    def code(self, row, field):
+        """Return the dictionary code of an encoded field (artist/album/genre)."""
+        return self.columns[field][row]
+
+    def rows(self):
+        """Yield the rows of all stored songs."""
+        return iter(self._rows.values())
+
+    def _encode(self, song: Song):
+        return [song.id, song.title, song.artist_id, song.album_id,
+                self._years.setdefault(song.year, song.year), song.genre_id]
@@ -0,0 +1,109 @@
+"""
+Fuzzy Search Index
+Contains a character-trigram inverted index for typo-tolerant song search.
+"""
+
+import heapq
+from collections import Counter
+
+from ..models import Song
+from ..utils import prefix_edit_similarity
+
+
+def trigrams(text):
+    """Return the set of padded, lowercased character trigrams of ``text``."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# === FUZZY SEARCH - TRIGRAM INVERTED INDEX ===
+
+class FuzzySongIndex:
+    """Inverted index from character trigrams to song IDs.
+
+    Each song is indexed by the trigrams of its title and artist. A query
+    is answered in two stages:
+    1. Candidate generation: count shared trigrams using only the selective
+       posting lists (very common trigrams are skipped while rarer ones
+       exist), then keep the best ``limit * candidate_factor`` songs.
+    2. Scoring: rank the candidates by trigram Dice similarity and,
+       optionally, by per-word edit distance to catch typos.
+
+    Trigram sets are recomputed from the song text when needed instead of
+    being stored per song, so memory is dominated by the posting lists.
+    """
+
+    def __init__(self, max_df=0.05, candidate_factor=5):
+        self.postings = {}
+        self.songs = {}
+        self.max_df = max_df
+        self.candidate_factor = candidate_factor
+
+    def __len__(self):
+        return len(self.songs)
+
+    @staticmethod
+    def _text(song: Song):
+        return f"{song.title} {song.artist}"
+
+    def add_song(self, song: Song):
+        """Index a song (re-indexing it if the ID is already present)."""
+        if song.id in self.songs:
+            self.remove_song(self.songs[song.id])
+        self.songs[song.id] = song
+        for gram in trigrams(self._text(song)):
+            self.postings.setdefault(gram, set()).add(song.id)
+
+    def remove_song(self, song: Song):
+        """Remove a song from the index."""
+        stored = self.songs.pop(song.id, None)
+        if stored is None:
+            return False
+        for gram in trigrams(self._text(stored)):
+            posting = self.postings.get(gram)
+            if posting is not None:
+                posting.discard(song.id)
+                if not posting:
+                    del self.postings[gram]
+        return True
+
+    def search(self, query, limit=10, rerank=True):
+        """Return up to ``limit`` songs ranked by similarity to ``query``."""
+        query_grams = trigrams(query)
+        postings = sorted(
+            (self.postings[g] for g in query_grams if g in self.postings),
+            key=len
+        )
+        if not postings:
+            return []
+        cutoff = max(limit * self.candidate_factor, int(len(self.songs) * self.max_df))
+        selective = [p for p in postings if len(p) <= cutoff] or postings[:1]
+
+        counts = Counter()
+        for posting in selective:
+            counts.update(posting)
+        candidates = [sid for sid, _ in counts.most_common(limit * self.candidate_factor)]
+
+        scored = []
+        for sid in candidates:
+            doc_grams = trigrams(self._text(self.songs[sid]))
+            dice = 2.0 * len(query_grams & doc_grams) / (len(query_grams) + len(doc_grams))
+            scored.append((dice, sid))
+
+        query_words = query.lower().split()
+        if rerank and query_words:
+            # Edit distance is the expensive part, so only rerank the head
+            head = heapq.nlargest(limit * 2, scored)
+            scored = [
+                ((dice + self._word_similarity(query_words, self.songs[sid])) / 2.0, sid)
+                for dice, sid in head
+            ]
+        return [self.songs[sid] for _, sid in heapq.nlargest(limit, scored)]
+
+    def _word_similarity(self, query_words, song: Song):
+        """Average, over query words, of the best edit similarity to a song word."""
+        words = self._text(song).lower().split()
+        total = 0.0
+        for qw in query_words:
+            total += max((prefix_edit_similarity(qw, w) for w in words), default=0.0)
+        return total / len(query_words)
@@ -3,29 +3,397 @@ Graph Data Structure
 Contains graph for managing similar songs based on artist/genre.
 """
 
+import heapq
+from array import array
+from collections import Counter, deque
+from itertools import chain
+
 from ..models import Song
+from .indexes import parse_year
 
 
 # === SIMILAR SONGS - GRAPH ===
 
 class SongGraph:
-    """Graph for tracking similar songs."""
+    """Graph for tracking similar songs.
+
+    Songs are also grouped into artist and genre buckets, keyed by the
+    songs' dictionary codes (``artist_id``/``genre_id``), so that the
+    neighbours of a single song can be found without scanning the whole
+    library.
+
+    With ``implicit=True`` the same-artist/same-genre edges are never
+    materialized: ``adj`` only holds custom links added through
+    ``add_similarity`` and the bucket union answers ``get_similar``.
+    Memory then grows linearly with the library instead of with the
+    size of every artist/genre clique.
+
+    Edges are weighted by ``similarity``: shared artist, album and genre
+    plus how close the release years are. ``adj`` maps each song ID to a
+    dict of neighbour ID -> weight, and ``recommend`` returns the
+    best-weighted neighbours. ``version`` is bumped on every change so
+    cached results (here and in other modules) can tell when they are stale.
+    """
+
+    ARTIST_WEIGHT = 3.0
+    ALBUM_WEIGHT = 2.0
+    GENRE_WEIGHT = 1.0
+    YEAR_WEIGHT = 1.0
+    YEAR_WINDOW = 10        # years apart at which the year bonus reaches 0
+    LINK_WEIGHT = 1.0       # bonus for links added with add_similarity
+    MAX_BULK_EDGES = 2_000_000  # add_songs refuses to store more edges (non-implicit)
     
-    def __init__(self):
+    def __init__(self, implicit=False):
+        self.implicit = implicit
         self.adj = {}
+        self.songs = {}
+        self.by_artist = {}
+        self.by_genre = {}
+        self.years = {}         # song ID -> parsed year (or None)
+        self.version = 0
+        self._recommend_cache = {}
+        self._cache_version = 0
+        self._frozen = None
+
+    def similarity(self, song1: Song, song2: Song):
+        """Return the weight of the edge between two songs."""
+        score = 0.0
+        if song1.artist_id == song2.artist_id:
+            score += self.ARTIST_WEIGHT
+        if song1.album_id == song2.album_id and song1.album:
+            score += self.ALBUM_WEIGHT
+        if song1.genre_id == song2.genre_id:
+            score += self.GENRE_WEIGHT
+        year1, year2 = self._year(song1), self._year(song2)
+        if year1 is not None and year2 is not None:
+            score += self.YEAR_WEIGHT * max(0.0, 1 - abs(year1 - year2) / self.YEAR_WINDOW)
+        return score
 
     def add_song(self, song: Song):
         """Add a song node to the graph."""
+        self.version += 1
         if song.id not in self.adj:
-            self.adj[song.id] = set()
+            self.adj[song.id] = {}
+        old = self.songs.get(song.id)
+        if old is not None and old is not song:
+            self._discard_from_bucket(self.by_artist, old.artist_id, song.id)
+            self._discard_from_bucket(self.by_genre, old.genre_id, song.id)
+        self.songs[song.id] = song
+        self.years[song.id] = parse_year(song.year)
+        self.by_artist.setdefault(song.artist_id, set()).add(song.id)
+        self.by_genre.setdefault(song.genre_id, set()).add(song.id)
 
-    def add_similarity(self, song1: Song, song2: Song):
-        """Add a similarity edge between two songs."""
+    def add_similarity(self, song1: Song, song2: Song, weight=None):
+        """Add a similarity edge between two songs.
+
+        Without an explicit ``weight`` the edge gets the songs' similarity
+        plus ``LINK_WEIGHT``, since the link was chosen on purpose.
+        """
         self.add_song(song1)
         self.add_song(song2)
-        self.adj[song1.id].add(song2.id)
-        self.adj[song2.id].add(song1.id)
+        if weight is None:
+            weight = self.similarity(song1, song2) + self.LINK_WEIGHT
+        self.adj[song1.id][song2.id] = weight
+        self.adj[song2.id][song1.id] = weight
+
+    def link_similar(self, song: Song):
+        """Add the song and connect it to every song sharing its artist or genre."""
+        self.add_song(song)
+        if self.implicit:
+            return
+        edges = self.adj[song.id]
+        for bucket in (self.by_artist[song.artist_id], self.by_genre[song.genre_id]):
+            for sid in bucket:
+                if sid != song.id and sid not in edges:
+                    weight = self.similarity(song, self.songs[sid])
+                    edges[sid] = weight
+                    self.adj[sid][song.id] = weight
+
+    def add_songs(self, songs):
+        """Add many songs, then connect each bucket once all nodes exist.
+
+        Without ``implicit`` every same-artist/same-genre pair becomes an
+        edge, which grows quadratically with the bucket sizes. A batch that
+        would leave more than ``MAX_BULK_EDGES`` such edges is refused
+        before anything is added; large libraries need ``implicit=True``.
+        """
+        songs = list(songs)
+        if not self.implicit and self.shared_pairs(songs) > self.MAX_BULK_EDGES:
+            raise ValueError("Import terlalu besar untuk graph kemiripan eksplisit; "
+                             "gunakan implicit_similarity=True.")
+        for song in songs:
+            self.add_song(song)
+        if self.implicit:
+            return
+        for song in songs:
+            self.link_similar(song)
+
+    def shared_pairs(self, songs=()):
+        """Return how many song pairs share an artist or genre once ``songs`` are added.
+
+        That is the number of bucket edges a non-implicit graph stores.
+        """
+        artists, genres, both = Counter(), Counter(), Counter()
+        for song in chain(self.songs.values(), songs):
+            artists[song.artist_id] += 1
+            genres[song.genre_id] += 1
+            both[song.artist_id, song.genre_id] += 1
+        pairs = lambda counts: sum(c * (c - 1) // 2 for c in counts.values())
+        return pairs(artists) + pairs(genres) - pairs(both)
+
+    def remove_song(self, song: Song):
+        """Remove a song node and all of its edges."""
+        edges = self.adj.pop(song.id, None)
+        if edges is None:
+            return False
+        self.version += 1
+        for sid in edges:
+            del self.adj[sid][song.id]
+        stored = self.songs.pop(song.id)
+        del self.years[song.id]
+        self._discard_from_bucket(self.by_artist, stored.artist_id, song.id)
+        self._discard_from_bucket(self.by_genre, stored.genre_id, song.id)
+        return True
+
+    def iter_similar(self, song_id):
+        """Lazily yield the IDs of songs similar to ``song_id``, without duplicates."""
+        explicit = self.adj.get(song_id, ())
+        yield from explicit
+        if not self.implicit:
+            return
+        song = self.songs.get(song_id)
+        if song is None:
+            return
+        same_artist = self.by_artist.get(song.artist_id, ())
+        for sid in same_artist:
+            if sid != song_id and sid not in explicit:
+                yield sid
+        for sid in self.by_genre.get(song.genre_id, ()):
+            if sid != song_id and sid not in explicit and sid not in same_artist:
+                yield sid
 
     def get_similar(self, song_id):
         """Get list of similar song IDs."""
-        return list(self.adj.get(song_id, []))
+        return list(self.iter_similar(song_id))
+
+    def weight(self, song_id, other_id):
+        """Return the edge weight between two songs (0 if they are not similar)."""
+        edges = self.adj.get(song_id)
+        if edges is None:
+            return 0.0
+        if other_id in edges:
+            return edges[other_id]
+        if self.implicit and other_id in self.songs:
+            song, other = self.songs[song_id], self.songs[other_id]
+            if song.artist_id == other.artist_id or song.genre_id == other.genre_id:
+                return self.similarity(song, other)
+        return 0.0
+
+    def weighted_neighbors(self, song_id):
+        """Lazily yield ``(neighbour_id, weight)`` for every song similar to ``song_id``."""
+        for sid in self.iter_similar(song_id):
+            yield sid, self.weight(song_id, sid)
+
+    def nearby_neighbors(self, width):
+        """Lazily yield ``(song_id, {neighbour_id: weight})`` for every song.
+
+        For implicit graphs, where scoring whole artist/genre buckets costs
+        O(bucket) per song. Each artist bucket is sorted by album and year
+        and each genre bucket by year, and a song is only scored against
+        the ``width`` songs around it in both orders, plus its custom
+        links. Those are the songs sharing its album or with the closest
+        years, so they hold (nearly always) its heaviest edges.
+        """
+        year_key = lambda sid: self.years[sid] or 0
+        artist_order, artist_pos = self._sorted_buckets(
+            self.by_artist, lambda sid: (self.songs[sid].album_id, year_key(sid)))
+        genre_order, genre_pos = self._sorted_buckets(self.by_genre, year_key)
+        for sid, song in self.songs.items():
+            row = dict(self.adj[sid])
+            for members, pos in ((artist_order[song.artist_id], artist_pos[sid]),
+                                 (genre_order[song.genre_id], genre_pos[sid])):
+                start = max(0, min(pos - width // 2, len(members) - width - 1))
+                for other in members[start:start + width + 1]:
+                    if other != sid and other not in row:
+                        row[other] = self.similarity(song, self.songs[other])
+            yield sid, row
+
+    def recommend(self, song_id, k=10):
+        """Return up to ``k`` ``(song_id, weight)`` pairs, most similar first.
+
+        A bounded heap (``heapq.nlargest``) keeps only the best ``k`` while
+        scanning the neighbours, and the result is cached until the graph
+        changes, so repeated calls for the same song do not rescan.
+        """
+        if self._cache_version != self.version:
+            self._recommend_cache.clear()
+            self._cache_version = self.version
+        cached = self._recommend_cache.get(song_id)
+        if cached is not None and (cached[0] >= k or len(cached[1]) < cached[0]):
+            return cached[1][:k]
+        best = heapq.nlargest(k, self.weighted_neighbors(song_id), key=lambda pair: pair[1])
+        self._recommend_cache[song_id] = (k, best)
+        return best
+
+    def freeze(self, max_degree=None):
+        """Return a read-only ``CSRGraph`` snapshot of the current graph.
+
+        Every row lists the neighbours heaviest first; ``max_degree`` keeps
+        only that many per song. The snapshot is cached until the graph
+        changes.
+        """
+        frozen = self._frozen
+        if frozen is not None and frozen.version == self.version and frozen.max_degree == max_degree:
+            return frozen
+        self._frozen = CSRGraph.from_graph(self, max_degree)
+        return self._frozen
+
+    def _year(self, song):
+        if self.songs.get(song.id) is song:
+            return self.years[song.id]
+        return parse_year(song.year)
+
+    @staticmethod
+    def _sorted_buckets(buckets, key):
+        """Return ``({code: sorted member list}, {song ID: position in it})``."""
+        order, position = {}, {}
+        for code, bucket in buckets.items():
+            members = order[code] = sorted(bucket, key=key)
+            for i, sid in enumerate(members):
+                position[sid] = i
+        return order, position
+
+    @staticmethod
+    def _discard_from_bucket(buckets, key, song_id):
+        bucket = buckets.get(key)
+        if bucket is not None:
+            bucket.discard(song_id)
+            if not bucket:
+                del buckets[key]
+
+
+# === SIMILAR SONGS - FROZEN CSR GRAPH ===
+
+class CSRGraph:
+    """Read-only compressed sparse row (CSR) form of a ``SongGraph``.
+
+    Songs are numbered 0..n-1 (``ids`` maps index -> song ID, ``index`` the
+    other way). The neighbours of song ``i`` are
+    ``indices[indptr[i]:indptr[i + 1]]``, heaviest edge first, with the
+    matching ``weights``. All three are flat ``array`` buffers, so an edge
+    costs 8 bytes instead of a dict entry per direction, and NumPy can wrap
+    them without copying (``numpy.frombuffer``). Walking node numbers
+    (``neighbor_indices``, ``bfs``) avoids the ID lookups entirely.
+    """
+
+    __slots__ = ('ids', 'index', 'indptr', 'indices', 'weights', 'version', 'max_degree')
+
+    CANDIDATE_FACTOR = 2    # implicit graphs: nearby songs scored per bucket, per kept edge
+
+    def __init__(self, ids, indptr, indices, weights, version=0, max_degree=None):
+        self.ids = ids
+        self.index = {sid: i for i, sid in enumerate(ids)}
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.version = version
+        self.max_degree = max_degree
+
+    @classmethod
+    def from_graph(cls, graph: SongGraph, max_degree=None):
+        """Build the CSR arrays from a mutable ``SongGraph``."""
+        ids = list(graph.songs)
+        index = {sid: i for i, sid in enumerate(ids)}
+        indptr = array('q', [0])
+        indices = array('i')
+        weights = array('f')
+        by_weight = lambda pair: pair[1]
+        if graph.implicit and max_degree is not None:
+            # Scoring whole buckets would be O(bucket) per song; a window
+            # of CANDIDATE_FACTOR * max_degree nearby songs per bucket is enough
+            rows = graph.nearby_neighbors(cls.CANDIDATE_FACTOR * max_degree)
+            rows = ((sid, row.items()) for sid, row in rows)
+        else:
+            rows = ((sid, graph.weighted_neighbors(sid)) for sid in ids)
+        for sid, row in rows:
+            if max_degree is None:
+                row = sorted(row, key=by_weight, reverse=True)
+            else:
+                row = heapq.nlargest(max_degree, row, key=by_weight)
+            for nid, weight in row:
+                indices.append(index[nid])
+                weights.append(weight)
+            indptr.append(len(indices))
+        return cls(ids, indptr, indices, weights, graph.version, max_degree)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, song_id):
+        return song_id in self.index
+
+    @property
+    def edge_count(self):
+        """Number of stored (directed) edges."""
+        return len(self.indices)
+
+    def degree(self, song_id):
+        """Return how many neighbours ``song_id`` has."""
+        i = self.index.get(song_id)
+        if i is None:
+            return 0
+        return self.indptr[i + 1] - self.indptr[i]
+
+    def iter_similar(self, song_id):
+        """Lazily yield the IDs of songs similar to ``song_id``, heaviest edge first."""
+        i = self.index.get(song_id)
+        if i is None:
+            return
+        ids = self.ids
+        for j in self.indices[self.indptr[i]:self.indptr[i + 1]]:
+            yield ids[j]
+
+    def get_similar(self, song_id):
+        """Get list of similar song IDs, heaviest edge first."""
+        i = self.index.get(song_id)
+        if i is None:
+            return []
+        ids = self.ids
+        return [ids[j] for j in self.indices[self.indptr[i]:self.indptr[i + 1]]]
+
+    def neighbor_indices(self, i):
+        """Return the node numbers adjacent to node ``i`` as an ``array`` slice."""
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def weighted_neighbors(self, song_id):
+        """Lazily yield ``(neighbour_id, weight)`` pairs, heaviest first."""
+        i = self.index.get(song_id)
+        if i is None:
+            return
+        start, end = self.indptr[i], self.indptr[i + 1]
+        ids = self.ids
+        for j, weight in zip(self.indices[start:end], self.weights[start:end]):
+            yield ids[j], weight
+
+    def bfs(self, song_id, max_depth=None):
+        """Breadth-first walk from ``song_id``; yield ``(song_id, depth)`` pairs.
+
+        The start song is yielded first with depth 0. Visited songs are
+        tracked in a ``bytearray`` indexed by node number.
+        """
+        start = self.index.get(song_id)
+        if start is None:
+            return
+        visited = bytearray(len(self.ids))
+        visited[start] = 1
+        queue = deque([(start, 0)])
+        indptr, indices, ids = self.indptr, self.indices, self.ids
+        while queue:
+            i, depth = queue.popleft()
+            yield ids[i], depth
+            if depth == max_depth:
+                continue
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                if not visited[j]:
+                    visited[j] = 1
+                    queue.append((j, depth + 1))
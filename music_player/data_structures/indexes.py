@@ -0,0 +1,130 @@
+"""
+Secondary Indexes
+Contains hash indexes (album, genre) and a sorted year index over the library.
+"""
+
+import heapq
+
+from ..models import Song, ALBUMS, GENRES
+from .tree import SongBST
+
+
+def parse_year(value):
+    """Return ``value`` as an int year, or ``None`` if it is not a number."""
+    try:
+        return int(str(value).strip())
+    except ValueError:
+        return None
+
+
+# === SECONDARY INDEX - HASH ===
+
+class HashIndex:
+    """Hash index from a song field to the songs having that value.
+
+    Each bucket is a dict of song ID -> song, so membership updates are O(1)
+    and the songs of one value can be iterated without copying.
+    """
+
+    def __init__(self, key_func):
+        self.key_func = key_func
+        self.buckets = {}
+
+    def add_song(self, song: Song):
+        """Index a song under its key."""
+        self.buckets.setdefault(self.key_func(song), {})[song.id] = song
+
+    def remove_song(self, song: Song):
+        """Remove a song from its key's bucket."""
+        key = self.key_func(song)
+        bucket = self.buckets.get(key)
+        if bucket is not None and bucket.pop(song.id, None) is not None:
+            if not bucket:
+                del self.buckets[key]
+            return True
+        return False
+
+    def get(self, key):
+        """Lazily iterate the songs stored under ``key``."""
+        return iter(self.buckets.get(key, {}).values())
+
+    def count(self, key):
+        """Return the number of songs stored under ``key`` in O(1)."""
+        return len(self.buckets.get(key, ()))
+
+
+# === SECONDARY INDEX - SORTED YEAR ===
+
+class YearIndex(SongBST):
+    """AVL tree of songs keyed by release year, for O(log n + k) range queries.
+
+    A year node holds thousands of songs in its ID dict, so adding or
+    deleting one song stays O(log n). Songs whose year is not a number are
+    not indexed.
+    """
+
+    def song_key(self, song: Song):
+        return parse_year(song.year)
+
+    def query_key(self, value):
+        return int(value)
+
+    def insert(self, song: Song):
+        if self.song_key(song) is not None:
+            super().insert(song)
+
+    def delete(self, song: Song):
+        if self.song_key(song) is None:
+            return False
+        return super().delete(song)
+
+
+class LibraryIndexes:
+    """Album, genre and year indexes kept in sync with the library."""
+
+    def __init__(self):
+        self.album = HashIndex(lambda song: song.album_id)
+        self.genre = HashIndex(lambda song: song.genre_id)
+        self.year = YearIndex()
+
+    def add_song(self, song: Song):
+        """Add a song to every index."""
+        self.album.add_song(song)
+        self.genre.add_song(song)
+        self.year.insert(song)
+
+    def remove_song(self, song: Song):
+        """Remove a song from every index."""
+        self.album.remove_song(song)
+        self.genre.remove_song(song)
+        self.year.delete(song)
+
+    def add_songs(self, songs):
+        """Add many songs, rebuilding the year tree once from sorted input."""
+        songs = list(songs)
+        for song in songs:
+            self.album.add_song(song)
+            self.genre.add_song(song)
+        dated = sorted((s for s in songs if parse_year(s.year) is not None),
+                       key=self.year.song_key)
+        self.year.build_from_sorted(
+            heapq.merge(self.year.inorder(), dated, key=self.year.song_key)
+        )
+
+    def by_album(self, album):
+        """Lazily iterate the songs of an album."""
+        code = ALBUMS.lookup(album)
+        return self.album.get(code) if code is not None else iter(())
+
+    def by_genre(self, genre):
+        """Lazily iterate the songs of a genre."""
+        code = GENRES.lookup(genre)
+        return self.genre.get(code) if code is not None else iter(())
+
+    def by_year(self, year):
+        """Lazily iterate the songs released in ``year``."""
+        return self.year.iter_range(year, year)
+
+    def by_year_range(self, low, high):
+        """Lazily iterate songs with ``low <= year <= high``, ordered by year."""
+        return self.year.iter_range(low, high)
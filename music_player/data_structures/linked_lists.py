@@ -3,13 +3,18 @@ Linked List Data Structures
 Contains Single Linked List, Doubly Linked List, and Multi-Linked List implementations.
 """
 
+import random
+
 from ..models import Song
+from .shuffle import ShuffleOrder
 
 
 # === LIBRARY - SINGLE LINKED LIST ===
 
 class SLLNode:
     """Node for Single Linked List."""
+
+    __slots__ = ('song', 'next')
     
     def __init__(self, song: Song):
         self.song = song
@@ -17,53 +22,77 @@ class SLLNode:
 
 
 class SongLibrarySLL:
-    """Single Linked List for managing the song library."""
+    """Single Linked List for managing the song library.
+
+    Besides the chain itself, the list keeps two hash maps so that lookups
+    and unlinking do not have to walk from the head:
+    - ``_nodes``: song ID -> node holding that song
+    - ``_prev``: song ID -> predecessor node (``None`` for the head)
+    """
     
     def __init__(self):
         self.head = None
+        self._nodes = {}
+        self._prev = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def __contains__(self, song_id):
+        return song_id in self._nodes
+
+    def __iter__(self):
+        cur = self.head
+        while cur:
+            yield cur.song
+            cur = cur.next
 
     def add_song(self, song: Song):
         """Add a song to the library."""
         node = SLLNode(song)
-        if not self.head:
-            self.head = node
-        else:
+        if self.head:
             node.next = self.head
-            self.head = node
+            self._prev[self.head.song.id] = node
+        self.head = node
+        self._nodes[song.id] = node
+        self._prev[song.id] = None
 
     def find_by_id(self, song_id):
-        """Find a song by its ID."""
-        cur = self.head
-        while cur:
-            if cur.song.id == song_id:
-                return cur.song
-            cur = cur.next
-        return None
+        """Find a song by its ID in O(1)."""
+        node = self._nodes.get(song_id)
+        return node.song if node else None
 
     def update_song(self, song_id, new_song: Song):
-        """Update a song in the library."""
-        cur = self.head
-        while cur:
-            if cur.song.id == song_id:
-                cur.song = new_song
-                return True
-            cur = cur.next
-        return False
+        """Update a song in the library in O(1)."""
+        node = self._nodes.get(song_id)
+        if not node:
+            return False
+        if new_song.id != song_id:
+            if new_song.id in self._nodes:
+                raise ValueError("ID lagu sudah digunakan.")
+            self._nodes[new_song.id] = self._nodes.pop(song_id)
+            self._prev[new_song.id] = self._prev.pop(song_id)
+        node.song = new_song
+        return True
 
     def delete_song(self, song_id):
-        """Delete a song from the library."""
-        cur = self.head
-        prev = None
-        while cur:
-            if cur.song.id == song_id:
-                if prev:
-                    prev.next = cur.next
-                else:
-                    self.head = cur.next
-                return cur.song
-            prev = cur
-            cur = cur.next
-        return None
+        """Delete a song from the library in O(1)."""
+        node = self._nodes.pop(song_id, None)
+        if not node:
+            return None
+        prev = self._prev.pop(song_id)
+        if prev:
+            prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            self._prev[node.next.song.id] = prev
+        node.next = None
+        return node.song
+
+    def song_ids(self):
+        """Return the IDs of all songs in the library."""
+        return list(self._nodes)
 
     def to_list(self):
         """Convert the linked list to a Python list."""
@@ -78,25 +107,139 @@ class SongLibrarySLL:
 # === PLAYLIST - DOUBLY LINKED LIST ===
 
 class DLLNode:
-    """Node for Doubly Linked List."""
+    """Node for Doubly Linked List.
+
+    Besides ``prev``/``next``, every node is also a node of an implicit
+    treap (a randomized balanced tree ordered by playlist position) that
+    ``PlaylistDLL`` uses as an order-statistic index: ``left``/``right``/
+    ``parent`` are the tree links and ``size`` is the subtree size.
+    """
+
+    __slots__ = ('song', 'prev', 'next',
+                 'left', 'right', 'parent', 'priority', 'size')
     
     def __init__(self, song: Song):
         self.song = song
         self.prev = None
         self.next = None
+        self.left = None
+        self.right = None
+        self.parent = None
+        self.priority = random.random()
+        self.size = 1
+
+
+def _size(node):
+    return node.size if node else 0
+
+
+def _pull(node):
+    """Recompute ``node.size`` and point its children back at it."""
+    node.size = 1 + _size(node.left) + _size(node.right)
+    if node.left:
+        node.left.parent = node
+    if node.right:
+        node.right.parent = node
+
+
+def _merge(a, b):
+    """Join two treaps where every node of ``a`` comes before every node of ``b``."""
+    if not a:
+        return b
+    if not b:
+        return a
+    if a.priority > b.priority:
+        a.right = _merge(a.right, b)
+        _pull(a)
+        return a
+    b.left = _merge(a, b.left)
+    _pull(b)
+    return b
+
+
+def _split(node, k):
+    """Split a treap into its first ``k`` nodes and the rest."""
+    if not node:
+        return None, None
+    if _size(node.left) >= k:
+        left, node.left = _split(node.left, k)
+        _pull(node)
+        if left:
+            left.parent = None
+        return left, node
+    node.right, right = _split(node.right, k - _size(node.left) - 1)
+    _pull(node)
+    if right:
+        right.parent = None
+    return node, right
+
+
+def _build(nodes):
+    """Build a treap over ``nodes`` (already in order) in O(k)."""
+    stack = []
+    for node in nodes:
+        last = None
+        while stack and stack[-1].priority < node.priority:
+            last = stack.pop()
+        node.left = last
+        node.right = None
+        if stack:
+            stack[-1].right = node
+        stack.append(node)
+    if not stack:
+        return None
+    root = stack[0]
+    # Children come after their parent in pre-order, so fix sizes in reverse
+    order = []
+    todo = [root]
+    while todo:
+        node = todo.pop()
+        order.append(node)
+        if node.left:
+            todo.append(node.left)
+        if node.right:
+            todo.append(node.right)
+    for node in reversed(order):
+        _pull(node)
+    root.parent = None
+    return root
 
 
 class PlaylistDLL:
-    """Doubly Linked List for playlist with forward/backward navigation."""
+    """Doubly Linked List for playlist with forward/backward navigation.
+
+    Next to the linked order the playlist keeps:
+    - an order-statistic index (implicit treap over the same nodes), so
+      jumping to a position, finding a node's position and inserting at a
+      position take O(log n)
+    - ``_nodes``: song ID -> the nodes holding that song, so removal by
+      song ID does not scan the list
+
+    Removing a node by handle unlinks it from the chain in O(1) and fixes
+    the index in O(log n).
+    """
     
     def __init__(self, name="Default Playlist"):
         self.name = name
         self.head = None
         self.tail = None
         self.current = None
+        self.root = None
+        self._nodes = {}
+        # Called as on_membership(song_id, playlist, present) when a song
+        # enters or leaves the playlist (see PlaylistManager)
+        self.on_membership = None
+        # ShuffleOrder over the nodes while shuffle mode is on
+        self.shuffle = None
+
+    def __len__(self):
+        return _size(self.root)
+
+    def __contains__(self, song_id):
+        return song_id in self._nodes
 
     def append(self, song: Song):
-        """Append a song to the playlist."""
+        """Append a song to the playlist and return its node."""
         node = DLLNode(song)
         if not self.head:
             self.head = self.tail = node
@@ -104,25 +247,184 @@ class PlaylistDLL:
             self.tail.next = node
             node.prev = self.tail
             self.tail = node
+        self.root = _merge(self.root, node)
+        self.root.parent = None
+        self._track(node)
+        return node
+
+    def insert_at(self, index, song: Song):
+        """Insert a song so that it ends up at ``index``; return its node."""
+        index = max(index, 0)
+        if index >= len(self):
+            return self.append(song)
+        node = DLLNode(song)
+        after = self.node_at(index)
+        self._link_chain(node, node, after.prev, after)
+        left, right = _split(self.root, index)
+        self.root = _merge(_merge(left, node), right)
+        self.root.parent = None
+        self._track(node)
+        return node
+
+    def extend(self, songs):
+        """Append many songs in O(k + log n) for k songs; return the new nodes."""
+        nodes = [DLLNode(song) for song in songs]
+        if not nodes:
+            return nodes
+        for a, b in zip(nodes, nodes[1:]):
+            a.next = b
+            b.prev = a
+        self._link_chain(nodes[0], nodes[-1], self.tail, None)
+        self.root = _merge(self.root, _build(nodes))
+        self.root.parent = None
+        for node in nodes:
+            self._track(node)
+        return nodes
+
+    def move_range(self, src_start, src_end, dst):
+        """Move the entries ``[src_start, src_end)`` so the first one lands at ``dst``.
+
+        ``dst`` is a position in the playlist without the moved range, i.e.
+        ``0 <= dst <= len(self) - (src_end - src_start)``. Nodes are relinked,
+        not copied, in O(log n) whatever the range length, so ``current`` and
+        node handles stay valid.
+        """
+        count = src_end - src_start
+        if src_start < 0 or src_end > len(self) or count <= 0:
+            raise IndexError("Rentang playlist tidak valid.")
+        if not 0 <= dst <= len(self) - count:
+            raise IndexError("Posisi tujuan tidak valid.")
+        if dst == src_start:
+            return
+
+        first = self.node_at(src_start)
+        last = self.node_at(src_end - 1)
+        self._unlink_chain(first, last)
+
+        left, rest = _split(self.root, src_start)
+        block, right = _split(rest, count)
+        rest = _merge(left, right)
+        if rest:
+            rest.parent = None
+        left, right = _split(rest, dst)
+        before = self._last(left)
+        after = self._first(right)
+        self.root = _merge(_merge(left, block), right)
+        self.root.parent = None
+        self._link_chain(first, last, before, after)
+
+    def splice(self, other, index=None):
+        """Move every entry of ``other`` into this playlist at ``index`` (default: the end).
+
+        The nodes are relinked in O(log n) plus the number of distinct songs
+        in ``other``; ``other`` is left empty.
+        """
+        if other is self:
+            raise ValueError("Tidak bisa splice playlist ke dirinya sendiri.")
+        if not other.head:
+            return
+        if index is None or index >= len(self):
+            index = len(self)
+        first, last, block = other.head, other.tail, other.root
+        moved = other._nodes
+        other.head = other.tail = other.current = other.root = None
+        if other.shuffle is not None:
+            other.shuffle = ShuffleOrder()
+        if self.shuffle is not None:
+            node = first
+            while node:
+                self.shuffle.add(node)
+                node = node.next
+        other._nodes = {}
+        for song_id, nodes in moved.items():
+            if other.on_membership:
+                other.on_membership(song_id, other, False)
+            if song_id not in self._nodes:
+                self._nodes[song_id] = {}
+                if self.on_membership:
+                    self.on_membership(song_id, self, True)
+            self._nodes[song_id].update(nodes)
+
+        left, right = _split(self.root, index)
+        self._link_chain(first, last, self._last(left), self._first(right))
+        self.root = _merge(_merge(left, block), right)
+        self.root.parent = None
 
     def remove(self, song_id):
-        """Remove a song from the playlist."""
-        cur = self.head
+        """Remove the first occurrence of a song from the playlist."""
+        nodes = self._nodes.get(song_id)
+        if not nodes:
+            return False
+        first = min(nodes, key=self.index_of) if len(nodes) > 1 else next(iter(nodes))
+        self.remove_node(first)
+        return True
+
+    def remove_node(self, node: DLLNode):
+        """Remove a node by handle: O(1) unlink, O(log n) index update."""
+        if node.prev:
+            node.prev.next = node.next
+        else:
+            self.head = node.next
+        if node.next:
+            node.next.prev = node.prev
+        else:
+            self.tail = node.prev
+        if self.current is node:
+            self.current = node.next or node.prev
+
+        # Replace the node by the merge of its subtrees, then fix sizes upward
+        parent = node.parent
+        child = _merge(node.left, node.right)
+        if child:
+            child.parent = parent
+        if not parent:
+            self.root = child
+        else:
+            if parent.left is node:
+                parent.left = child
+            else:
+                parent.right = child
+            while parent:
+                parent.size -= 1
+                parent = parent.parent
+
+        self._untrack(node)
+        node.prev = node.next = node.left = node.right = node.parent = None
+        node.size = 1
+        return node.song
+
+    def index_of(self, node: DLLNode):
+        """Return the position of a node in O(log n)."""
+        index = _size(node.left)
+        while node.parent:
+            if node is node.parent.right:
+                index += _size(node.parent.left) + 1
+            node = node.parent
+        return index
+
+    def node_at(self, index):
+        """Return the node at ``index`` in O(log n), or ``None``."""
+        if index < 0 or index >= len(self):
+            return None
+        cur = self.root
         while cur:
-            if cur.song.id == song_id:
-                if cur.prev:
-                    cur.prev.next = cur.next
-                else:
-                    self.head = cur.next
-                if cur.next:
-                    cur.next.prev = cur.prev
-                else:
-                    self.tail = cur.prev
-                if self.current == cur:
-                    self.current = cur.next or cur.prev
-                return True
-            cur = cur.next
-        return False
+            left = _size(cur.left)
+            if index < left:
+                cur = cur.left
+            elif index == left:
+                return cur
+            else:
+                index -= left + 1
+                cur = cur.right
+        return None
+
+    def nodes_of(self, song_id):
+        """Return the nodes holding ``song_id`` (in no particular order)."""
+        return list(self._nodes.get(song_id, ()))
+
+    def song_ids(self):
+        """Return the distinct song IDs in the playlist."""
+        return list(self._nodes)
 
     def to_list(self):
         """Convert the doubly linked list to a Python list."""
@@ -134,19 +436,37 @@ class PlaylistDLL:
         return result
 
     def set_current_by_index(self, index):
-        """Set the current song by index."""
+        """Set the current song by index in O(log n)."""
+        node = self.node_at(index)
+        if not node:
+            return None
+        self.current = node
+        return node.song
+
+    def set_shuffle(self, enabled):
+        """Turn shuffle mode on or off.
+
+        Turning it on starts a new lazily drawn order that begins with the
+        current song; ``next_song``/``prev_song`` then follow that order.
+        """
+        if not enabled:
+            self.shuffle = None
+            return
+        nodes = []
         cur = self.head
-        i = 0
         while cur:
-            if i == index:
-                self.current = cur
-                return cur.song
-            i += 1
+            nodes.append(cur)
             cur = cur.next
-        return None
+        self.shuffle = ShuffleOrder(nodes, current=self.current)
 
     def next_song(self):
         """Get the next song in the playlist."""
+        if self.shuffle is not None:
+            node = self.shuffle.next()
+            if node:
+                self.current = node
+                return node.song
+            return None
         if self.current and self.current.next:
             self.current = self.current.next
             return self.current.song
@@ -154,80 +474,189 @@ class PlaylistDLL:
 
     def prev_song(self):
         """Get the previous song in the playlist."""
+        if self.shuffle is not None:
+            node = self.shuffle.prev()
+            if node:
+                self.current = node
+                return node.song
+            return None
         if self.current and self.current.prev:
             self.current = self.current.prev
             return self.current.song
         return None
 
+    @staticmethod
+    def _first(root):
+        while root and root.left:
+            root = root.left
+        return root
+
+    @staticmethod
+    def _last(root):
+        while root and root.right:
+            root = root.right
+        return root
+
+    def _link_chain(self, first, last, before, after):
+        """Link the chain ``first..last`` between ``before`` and ``after``."""
+        first.prev = before
+        last.next = after
+        if before:
+            before.next = first
+        else:
+            self.head = first
+        if after:
+            after.prev = last
+        else:
+            self.tail = last
+
+    def _unlink_chain(self, first, last):
+        """Detach the chain ``first..last`` from its neighbours."""
+        if first.prev:
+            first.prev.next = last.next
+        else:
+            self.head = last.next
+        if last.next:
+            last.next.prev = first.prev
+        else:
+            self.tail = first.prev
+        first.prev = last.next = None
+
+    def _track(self, node):
+        nodes = self._nodes.get(node.song.id)
+        if nodes is None:
+            nodes = self._nodes[node.song.id] = {}
+            if self.on_membership:
+                self.on_membership(node.song.id, self, True)
+        nodes[node] = None
+        if self.shuffle is not None:
+            self.shuffle.add(node)
+
+    def _untrack(self, node):
+        if self.shuffle is not None:
+            self.shuffle.remove(node)
+        nodes = self._nodes.get(node.song.id)
+        if nodes is not None:
+            nodes.pop(node, None)
+            if not nodes:
+                del self._nodes[node.song.id]
+                if self.on_membership:
+                    self.on_membership(node.song.id, self, False)
+
 
 # === ARTIST -> SONGS - MULTI-LINKED LIST ===
 
 class ArtistSongNode:
     """Node for songs within an artist's song list."""
+
+    __slots__ = ('song', 'prev_song', 'next_song')
     
     def __init__(self, song: Song):
         self.song = song
+        self.prev_song = None
         self.next_song = None
 
 
 class ArtistNode:
-    """Node representing an artist with their songs."""
+    """Node representing an artist with their songs.
+
+    ``songs`` maps song ID -> ``ArtistSongNode`` so a song can be found and
+    unlinked from the (doubly linked) song chain in O(1).
+    """
+
+    __slots__ = ('artist_name', 'first_song', 'prev_artist', 'next_artist', 'songs')
     
     def __init__(self, artist_name):
         self.artist_name = artist_name
         self.first_song = None
+        self.prev_artist = None
         self.next_artist = None
+        self.songs = {}
 
 
 class ArtistMultiLinkedList:
-    """Multi-Linked List for grouping songs by artist."""
+    """Multi-Linked List for grouping songs by artist.
+
+    Artists stay linked in first-added order, and a name -> ``ArtistNode``
+    directory gives O(1) artist lookup, so adding or removing a song never
+    walks the artist chain.
+    """
     
     def __init__(self):
         self.head_artist = None
+        self.tail_artist = None
+        self._artists = {}
+
+    def __len__(self):
+        return len(self._artists)
 
     def add_song(self, song: Song):
         """Add a song to an artist's song list."""
-        cur_artist = self.head_artist
-        prev_artist = None
-        while cur_artist:
-            if cur_artist.artist_name == song.artist:
-                break
-            prev_artist = cur_artist
-            cur_artist = cur_artist.next_artist
-
-        if not cur_artist:
-            cur_artist = ArtistNode(song.artist)
+        artist = self._artists.get(song.artist)
+        if not artist:
+            artist = ArtistNode(song.artist)
+            self._artists[song.artist] = artist
             if not self.head_artist:
-                self.head_artist = cur_artist
+                self.head_artist = artist
             else:
-                prev_artist.next_artist = cur_artist
+                self.tail_artist.next_artist = artist
+                artist.prev_artist = self.tail_artist
+            self.tail_artist = artist
+
+        existing = artist.songs.get(song.id)
+        if existing:
+            existing.song = song
+            return
 
         new_song_node = ArtistSongNode(song)
-        new_song_node.next_song = cur_artist.first_song
-        cur_artist.first_song = new_song_node
+        new_song_node.next_song = artist.first_song
+        if artist.first_song:
+            artist.first_song.prev_song = new_song_node
+        artist.first_song = new_song_node
+        artist.songs[song.id] = new_song_node
 
     def remove_song(self, song: Song):
         """Remove a song from an artist's song list."""
-        cur_artist = self.head_artist
-        prev_artist = None
-        while cur_artist:
-            if cur_artist.artist_name == song.artist:
-                cur_song = cur_artist.first_song
-                prev_song = None
-                while cur_song:
-                    if cur_song.song.id == song.id:
-                        if prev_song:
-                            prev_song.next_song = cur_song.next_song
-                        else:
-                            cur_artist.first_song = cur_song.next_song
-                        break
-                    prev_song = cur_song
-                    cur_song = cur_song.next_song
-                if not cur_artist.first_song:
-                    if prev_artist:
-                        prev_artist.next_artist = cur_artist.next_artist
-                    else:
-                        self.head_artist = cur_artist.next_artist
-                return
-            prev_artist = cur_artist
-            cur_artist = cur_artist.next_artist
+        artist = self._artists.get(song.artist)
+        if not artist:
+            return
+        node = artist.songs.pop(song.id, None)
+        if not node:
+            return
+        if node.prev_song:
+            node.prev_song.next_song = node.next_song
+        else:
+            artist.first_song = node.next_song
+        if node.next_song:
+            node.next_song.prev_song = node.prev_song
+
+        if not artist.first_song:
+            del self._artists[artist.artist_name]
+            if artist.prev_artist:
+                artist.prev_artist.next_artist = artist.next_artist
+            else:
+                self.head_artist = artist.next_artist
+            if artist.next_artist:
+                artist.next_artist.prev_artist = artist.prev_artist
+            else:
+                self.tail_artist = artist.prev_artist
+
+    def iter_artists(self):
+        """Yield artist names in the order they were first added."""
+        cur = self.head_artist
+        while cur:
+            yield cur.artist_name
+            cur = cur.next_artist
+
+    def songs_by_artist(self, artist_name):
+        """Yield an artist's songs by walking their chain (no list copy)."""
+        artist = self._artists.get(artist_name)
+        cur = artist.first_song if artist else None
+        while cur:
+            yield cur.song
+            cur = cur.next_song
+
+    def song_count(self, artist_name):
+        """Return how many songs an artist has, in O(1)."""
+        artist = self._artists.get(artist_name)
+        return len(artist.songs) if artist else 0
@@ -0,0 +1,161 @@
+"""
+Play Statistics
+Contains play counters for songs, artists and genres with top-K queries.
+"""
+
+from ..models import Song, ARTISTS, GENRES
+
+
+# === PLAY COUNTS - LFU COUNT BUCKETS ===
+
+class CountBucket:
+    """All keys that currently share the same play count."""
+
+    __slots__ = ('count', 'keys', 'lower', 'higher')
+
+    def __init__(self, count):
+        self.count = count
+        self.keys = {}          # key -> None, in the order they reached count
+        self.lower = None
+        self.higher = None
+
+
+class PlayCounter:
+    """Counts plays per key and keeps the keys grouped by count.
+
+    The buckets form a doubly linked list sorted by count (the LFU-cache
+    layout). A play moves its key from bucket ``c`` to the neighbouring
+    bucket ``c + 1``, so ``increment`` is O(1), and ``top(k)`` walks down
+    from the highest bucket in O(k) without sorting anything. Keys with the
+    same count are listed in the order they reached it.
+    """
+
+    def __init__(self):
+        self._bucket_of = {}
+        self.lowest = None
+        self.highest = None
+
+    def __len__(self):
+        return len(self._bucket_of)
+
+    def __contains__(self, key):
+        return key in self._bucket_of
+
+    def count(self, key):
+        """Return the play count of ``key`` (0 if never played)."""
+        bucket = self._bucket_of.get(key)
+        return bucket.count if bucket else 0
+
+    def increment(self, key):
+        """Add one play to ``key`` and return its new count."""
+        bucket = self._bucket_of.get(key)
+        if bucket is None:
+            count, lower, higher = 1, None, self.lowest
+        else:
+            count, lower, higher = bucket.count + 1, bucket, bucket.higher
+        if higher is not None and higher.count == count:
+            target = higher
+        else:
+            target = CountBucket(count)
+            self._link(target, lower, higher)
+        target.keys[key] = None
+        self._bucket_of[key] = target
+        if bucket is not None:
+            self._remove_key(bucket, key)
+        return count
+
+    def discard(self, key):
+        """Forget all plays of ``key``."""
+        bucket = self._bucket_of.pop(key, None)
+        if bucket is not None:
+            self._remove_key(bucket, key)
+
+    def top(self, k=None):
+        """Yield ``(key, count)`` pairs, most played first (at most ``k``)."""
+        remaining = k
+        bucket = self.highest
+        while bucket is not None and remaining != 0:
+            for key in bucket.keys:
+                yield key, bucket.count
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+            bucket = bucket.lower
+
+    def clear(self):
+        """Forget all counts."""
+        self._bucket_of = {}
+        self.lowest = self.highest = None
+
+    def _remove_key(self, bucket, key):
+        del bucket.keys[key]
+        if not bucket.keys:
+            self._unlink(bucket)
+
+    def _link(self, bucket, lower, higher):
+        bucket.lower, bucket.higher = lower, higher
+        if lower:
+            lower.higher = bucket
+        else:
+            self.lowest = bucket
+        if higher:
+            higher.lower = bucket
+        else:
+            self.highest = bucket
+
+    def _unlink(self, bucket):
+        if bucket.lower:
+            bucket.lower.higher = bucket.higher
+        else:
+            self.lowest = bucket.higher
+        if bucket.higher:
+            bucket.higher.lower = bucket.lower
+        else:
+            self.highest = bucket.lower
+
+
+# === PLAY STATISTICS - PER SONG, ARTIST AND GENRE ===
+
+class PlayStatistics:
+    """Session play counts for songs, artists and genres.
+
+    Songs are counted by ID; artists and genres by their dictionary codes,
+    which are decoded only for the top-K results.
+    """
+
+    def __init__(self):
+        self.songs = PlayCounter()
+        self.artists = PlayCounter()
+        self.genres = PlayCounter()
+        self.total = 0
+
+    def record(self, song: Song):
+        """Count one play of ``song``."""
+        self.songs.increment(song.id)
+        self.artists.increment(song.artist_id)
+        self.genres.increment(song.genre_id)
+        self.total += 1
+
+    def forget_song(self, song_id):
+        """Drop the song's own counter (artist and genre totals are kept)."""
+        self.songs.discard(song_id)
+
+    def top_songs(self, k=10):
+        """Return up to ``k`` ``(song_id, plays)`` pairs, most played first."""
+        return list(self.songs.top(k))
+
+    def top_artists(self, k=10):
+        """Return up to ``k`` ``(artist, plays)`` pairs, most played first."""
+        return [(ARTISTS.decode(code), n) for code, n in self.artists.top(k)]
+
+    def top_genres(self, k=10):
+        """Return up to ``k`` ``(genre, plays)`` pairs, most played first."""
+        return [(GENRES.decode(code), n) for code, n in self.genres.top(k)]
+
+    def reset(self):
+        """Start a new session with all counts at zero."""
+        self.songs.clear()
+        self.artists.clear()
+        self.genres.clear()
+        self.total = 0
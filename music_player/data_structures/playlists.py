@@ -0,0 +1,88 @@
+"""
+Playlist Manager
+Contains a manager for many named playlists with a song -> playlists index.
+"""
+
+from .linked_lists import PlaylistDLL
+
+
+# === PLAYLISTS - NAMED PLAYLISTS + REVERSE MEMBERSHIP INDEX ===
+
+class PlaylistManager:
+    """Holds named ``PlaylistDLL`` instances and knows which contain a song.
+
+    ``membership`` maps song ID -> the playlists that contain it. Playlists
+    report songs entering and leaving through their ``on_membership`` hook,
+    so the index stays correct however a playlist is edited. Removing a song
+    from every playlist then costs O(occurrences), not O(total length).
+    """
+
+    def __init__(self):
+        self.playlists = {}
+        self.membership = {}
+
+    def __len__(self):
+        return len(self.playlists)
+
+    def __contains__(self, name):
+        return name in self.playlists
+
+    def names(self):
+        """Return playlist names in creation order."""
+        return list(self.playlists)
+
+    def get(self, name):
+        """Return the playlist called ``name``, or ``None``."""
+        return self.playlists.get(name)
+
+    def create(self, name):
+        """Create and register an empty playlist."""
+        if name in self.playlists:
+            raise ValueError("Nama playlist sudah digunakan.")
+        playlist = PlaylistDLL(name)
+        self.playlists[name] = playlist
+        playlist.on_membership = self._on_membership
+        return playlist
+
+    def delete(self, name):
+        """Unregister a playlist and drop its songs from the membership index."""
+        playlist = self.playlists.pop(name, None)
+        if playlist is None:
+            raise ValueError("Playlist tidak ditemukan.")
+        playlist.on_membership = None
+        for song_id in playlist.song_ids():
+            self._on_membership(song_id, playlist, False)
+        return playlist
+
+    def rename(self, old_name, new_name):
+        """Rename a playlist."""
+        if new_name in self.playlists:
+            raise ValueError("Nama playlist sudah digunakan.")
+        playlist = self.playlists.pop(old_name, None)
+        if playlist is None:
+            raise ValueError("Playlist tidak ditemukan.")
+        playlist.name = new_name
+        self.playlists[new_name] = playlist
+
+    def playlists_containing(self, song_id):
+        """Return the playlists that contain ``song_id``."""
+        return list(self.membership.get(song_id, ()))
+
+    def remove_song_everywhere(self, song_id):
+        """Remove every occurrence of a song from every playlist; return the count."""
+        removed = 0
+        for playlist in self.playlists_containing(song_id):
+            for node in playlist.nodes_of(song_id):
+                playlist.remove_node(node)
+                removed += 1
+        return removed
+
+    def _on_membership(self, song_id, playlist, present):
+        if present:
+            self.membership.setdefault(song_id, {})[playlist] = None
+            return
+        owners = self.membership.get(song_id)
+        if owners is not None:
+            owners.pop(playlist, None)
+            if not owners:
+                del self.membership[song_id]
@@ -0,0 +1,89 @@
+"""
+Shuffle Order
+Contains a lazily drawn random permutation used by the shuffle mode.
+"""
+
+import random
+
+
+# === SHUFFLE - INCREMENTAL FISHER-YATES ===
+
+class ShuffleOrder:
+    """Uniform random order over a set of items, drawn one step at a time.
+
+    ``pool[:drawn]`` is the order played so far and ``pool[drawn:]`` are
+    the items not drawn yet. ``next()`` performs a single Fisher-Yates step
+    (pick a random undrawn item and swap it to the front of the undrawn
+    part), so every step is O(1) and nothing is shuffled up front.
+    ``prev()``/``next()`` move a cursor back and forth through the drawn part.
+
+    Items may be added or removed mid-shuffle: added items join the undrawn
+    part, removed items are remembered in ``removed`` and skipped (and
+    dropped from the pool when a draw hits them). Items must be hashable
+    and unique, and only items that are in the order may be removed.
+    """
+
+    def __init__(self, items=(), current=None, rng=None):
+        self.pool = list(items)
+        self.drawn = 0
+        self.cursor = -1
+        self.removed = set()
+        self.rng = rng or random.Random()
+        if current is not None:
+            # The item already playing becomes the first step of the order
+            i = self.pool.index(current)
+            self.pool[0], self.pool[i] = self.pool[i], self.pool[0]
+            self.drawn = 1
+            self.cursor = 0
+
+    def __len__(self):
+        return len(self.pool) - len(self.removed)
+
+    @property
+    def current(self):
+        """The item at the cursor, or ``None`` before the first step."""
+        if self.cursor < 0 or self.pool[self.cursor] in self.removed:
+            return None
+        return self.pool[self.cursor]
+
+    def next(self):
+        """Step forward, drawing a new random item if needed; ``None`` when exhausted."""
+        pool = self.pool
+        while self.cursor + 1 < self.drawn:
+            self.cursor += 1
+            if pool[self.cursor] not in self.removed:
+                return pool[self.cursor]
+        while self.drawn < len(pool):
+            j = self.rng.randrange(self.drawn, len(pool))
+            item = pool[j]
+            if item in self.removed:
+                pool[j] = pool[-1]
+                pool.pop()
+                self.removed.discard(item)
+                continue
+            pool[self.drawn], pool[j] = item, pool[self.drawn]
+            self.cursor = self.drawn
+            self.drawn += 1
+            return item
+        return None
+
+    def prev(self):
+        """Step back through the items already drawn; ``None`` at the start."""
+        cursor = self.cursor - 1
+        while cursor >= 0:
+            if self.pool[cursor] not in self.removed:
+                self.cursor = cursor
+                return self.pool[cursor]
+            cursor -= 1
+        return None
+
+    def add(self, item):
+        """Add an item; it can be drawn in any later step."""
+        if item in self.removed:
+            self.removed.discard(item)
+        else:
+            self.pool.append(item)
+
+    def remove(self, item):
+        """Remove an item from the order in O(1)."""
+        self.removed.add(item)
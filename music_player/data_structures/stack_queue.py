@@ -3,6 +3,8 @@ Stack and Queue Data Structures
 Contains Stack for playback history and Queue for up-next songs.
 """
 
+import heapq
+
 from ..models import Song
 
 
@@ -10,6 +12,8 @@ from ..models import Song
 
 class StackNode:
     """Node for Stack."""
+
+    __slots__ = ('song', 'next')
     
     def __init__(self, song: Song, next_node=None):
         self.song = song
@@ -35,42 +39,179 @@ class PlaybackHistoryStack:
         return song
 
 
-# === UP NEXT - QUEUE ===
+class BoundedHistoryStack:
+    """Playback history with a fixed capacity, backed by a ring buffer.
+
+    The buffer is preallocated once; when it is full, a push overwrites the
+    oldest entry, so memory stays bounded however long the player runs.
+    ``push``, ``pop`` and ``peek(k)`` are O(1).
+    """
+
+    __slots__ = ('capacity', '_buffer', '_top', '_count')
+
+    def __init__(self, capacity=1000):
+        if capacity < 1:
+            raise ValueError("Kapasitas history harus lebih dari 0.")
+        self.capacity = capacity
+        self._buffer = [None] * capacity
+        self._top = 0          # slot the next push writes to
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        """Iterate the history from the most recent song to the oldest."""
+        for k in range(self._count):
+            yield self._buffer[(self._top - 1 - k) % self.capacity]
+
+    def push(self, song: Song):
+        """Push a song onto the history, dropping the oldest one when full."""
+        self._buffer[self._top] = song
+        self._top = (self._top + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def pop(self):
+        """Pop the most recent song from the history."""
+        if not self._count:
+            return None
+        self._top = (self._top - 1) % self.capacity
+        song = self._buffer[self._top]
+        self._buffer[self._top] = None
+        self._count -= 1
+        return song
+
+    def peek(self, k=0):
+        """Return the ``k``-th most recent song (0 = last played) without popping."""
+        if not 0 <= k < self._count:
+            return None
+        return self._buffer[(self._top - 1 - k) % self.capacity]
+
+
+# === UP NEXT - PRIORITY QUEUE ===
 
 class QueueNode:
     """Node for Queue."""
+
+    __slots__ = ('song', 'next', 'priority', 'removed')
     
-    def __init__(self, song: Song):
+    def __init__(self, song: Song, priority=0):
         self.song = song
         self.next = None
+        self.priority = priority
+        self.removed = False
 
 
-class UpNextQueue:
-    """Queue for managing up-next songs."""
-    
+class QueueLevel:
+    """FIFO chain of the queued songs that share one priority."""
+
+    __slots__ = ('front', 'rear', 'size')
+
     def __init__(self):
         self.front = None
         self.rear = None
+        self.size = 0
 
-    def enqueue(self, song: Song):
-        """Add a song to the up-next queue."""
-        node = QueueNode(song)
-        if not self.rear:
-            self.front = self.rear = node
+
+class UpNextQueue:
+    """Queue for managing up-next songs, with priorities.
+
+    Every priority has its own linked FIFO (``QueueLevel``), so songs of the
+    same priority keep their order, and a heap holds the priorities in use.
+    Higher priorities play first: ``PLAY_NEXT`` jumps ahead of everything
+    added with ``ADD``. ``enqueue``/``dequeue`` are O(log p) for p distinct
+    priorities and ``peek`` is O(1).
+
+    ``remove(song_id)`` only marks the song's nodes as removed; they are
+    unlinked once they reach the front of their level, and a level that ran
+    empty leaves the heap once it reaches the top.
+    """
+
+    ADD = 0
+    PLAY_NEXT = 1
+
+    def __init__(self):
+        self._levels = {}       # priority -> QueueLevel (each one is in the heap)
+        self._heap = []         # negated priorities, highest priority first
+        self._nodes = {}        # song ID -> {node: None} of the live nodes
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, song_id):
+        return song_id in self._nodes
+
+    def __iter__(self):
+        """Iterate the queued songs in play order without copying them."""
+        for priority in sorted(self._levels, reverse=True):
+            node = self._levels[priority].front
+            while node:
+                if not node.removed:
+                    yield node.song
+                node = node.next
+
+    def enqueue(self, song: Song, priority=ADD):
+        """Add a song to the up-next queue behind songs of the same priority."""
+        node = QueueNode(song, priority)
+        level = self._levels.get(priority)
+        if level is None:
+            level = self._levels[priority] = QueueLevel()
+            heapq.heappush(self._heap, -priority)
+        if not level.rear:
+            level.front = level.rear = node
         else:
-            self.rear.next = node
-            self.rear = node
+            level.rear.next = node
+            level.rear = node
+        level.size += 1
+        self._nodes.setdefault(song.id, {})[node] = None
+        self._size += 1
 
     def dequeue(self):
         """Remove and return the next song from the queue."""
-        if not self.front:
+        if not self._size:
             return None
-        node = self.front
-        self.front = self.front.next
-        if not self.front:
-            self.rear = None
+        level = self._levels[-self._heap[0]]
+        node = level.front
+        level.front = node.next
+        self._drop(node, level)
         return node.song
 
+    def peek(self):
+        """Return the next song without removing it."""
+        if not self._size:
+            return None
+        return self._levels[-self._heap[0]].front.song
+
+    def remove(self, song_id):
+        """Remove every queued entry of ``song_id``; return how many were removed."""
+        nodes = self._nodes.get(song_id)
+        if not nodes:
+            return 0
+        removed = len(nodes)
+        for node in list(nodes):
+            node.removed = True
+            self._drop(node, self._levels[node.priority])
+        return removed
+
     def is_empty(self):
         """Check if the queue is empty."""
-        return self.front is None
+        return self._size == 0
+
+    def _drop(self, node, level):
+        """Forget a dequeued or removed node and restore the front invariants."""
+        nodes = self._nodes[node.song.id]
+        del nodes[node]
+        if not nodes:
+            del self._nodes[node.song.id]
+        level.size -= 1
+        self._size -= 1
+        # Every level's front is a live node
+        while level.front and level.front.removed:
+            level.front = level.front.next
+        if not level.front:
+            level.rear = None
+        # The top of the heap is a non-empty level
+        while self._heap and not self._levels[-self._heap[0]].size:
+            del self._levels[-heapq.heappop(self._heap)]
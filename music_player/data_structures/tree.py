@@ -1,6 +1,6 @@
 """
 Binary Search Tree
-Contains BST for efficient song title search.
+Contains a self-balancing (AVL) BST for efficient song title search.
 """
 
 from ..models import Song
@@ -9,38 +9,254 @@ from ..models import Song
 # === SONG SEARCH - BINARY SEARCH TREE ===
 
 class TreeNode:
-    """Node for Binary Search Tree."""
-    
+    """Node for Binary Search Tree.
+
+    Songs that share a title share one node, so ``songs`` maps the ID of
+    every song stored under ``key`` to the song, in insertion order. Adding
+    or removing one song is O(1) however many share the key.
+    """
+
+    __slots__ = ('key', 'songs', 'left', 'right', 'height')
+
     def __init__(self, key, song: Song):
-        self.key = key.lower()
-        self.song = song
+        self.key = key
+        self.songs = {song.id: song}
         self.left = None
         self.right = None
+        self.height = 1
+
+    @property
+    def song(self):
+        """The first song stored under this key."""
+        return next(iter(self.songs.values()))
+
+    def put(self, song: Song):
+        """Add a song, replacing the entry that has the same ID."""
+        added = song.id not in self.songs
+        self.songs[song.id] = song
+        return added
+
+
+def _height(node):
+    return node.height if node else 0
+
+
+def _update_height(node):
+    node.height = 1 + max(_height(node.left), _height(node.right))
+
+
+def _rotate_right(node):
+    pivot = node.left
+    node.left = pivot.right
+    pivot.right = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rotate_left(node):
+    pivot = node.right
+    node.right = pivot.left
+    pivot.left = node
+    _update_height(node)
+    _update_height(pivot)
+    return pivot
+
+
+def _rebalance(node):
+    """Restore the AVL invariant at ``node`` and return the new subtree root."""
+    _update_height(node)
+    balance = _height(node.left) - _height(node.right)
+    if balance > 1:
+        if _height(node.left.left) < _height(node.left.right):
+            node.left = _rotate_left(node.left)
+        return _rotate_right(node)
+    if balance < -1:
+        if _height(node.right.right) < _height(node.right.left):
+            node.right = _rotate_right(node.right)
+        return _rotate_left(node)
+    return node
 
 
 class SongBST:
-    """Binary Search Tree for searching songs by title."""
-    
-    def __init__(self):
+    """Binary Search Tree for searching songs by title.
+
+    The tree is an AVL tree by default, so insert, search and delete are
+    O(log n) whatever order the titles arrive in. Insert and delete are
+    iterative and retrace the visited path, so deep trees never hit
+    Python's recursion limit. ``SongBST(balanced=False)`` keeps the plain,
+    never-rebalanced behaviour.
+
+    Each key can hold several songs, so songs with the same title are all
+    searchable and can be deleted one at a time.
+
+    Subclasses can index by another field by overriding ``song_key`` (the
+    key of a stored song) and ``query_key`` (normalizes a lookup value).
+    """
+
+    def __init__(self, balanced=True):
         self.root = None
+        self.size = 0   # distinct titles (nodes)
+        self.count = 0  # songs
+        self.balanced = balanced
+
+    def __len__(self):
+        return self.count
+
+    def song_key(self, song: Song):
+        """Return the key a song is stored under (its lowercased title)."""
+        return song.title.lower()
+
+    def query_key(self, value):
+        """Normalize a lookup value into a key."""
+        return value.lower()
 
     def insert(self, song: Song):
         """Insert a song into the BST."""
-        def _insert(node, key, song):
-            if not node:
-                return TreeNode(key, song)
-            if key < node.key:
-                node.left = _insert(node.left, key, song)
-            elif key > node.key:
-                node.right = _insert(node.right, key, song)
+        key = self.song_key(song)
+        path = []
+        cur = self.root
+        while cur:
+            if key < cur.key:
+                path.append(cur)
+                cur = cur.left
+            elif key > cur.key:
+                path.append(cur)
+                cur = cur.right
             else:
-                node.song = song
+                if cur.put(song):
+                    self.count += 1
+                return
+
+        node = TreeNode(key, song)
+        self.size += 1
+        self.count += 1
+        if not path:
+            self.root = node
+            return
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        self._retrace(path)
+
+    def delete(self, song: Song):
+        """Delete one song (matched by ID) in O(log n).
+
+        The node itself is unlinked only when its last song is removed.
+        """
+        key = self.song_key(song)
+        path = []
+        cur = self.root
+        while cur and cur.key != key:
+            path.append(cur)
+            cur = cur.left if key < cur.key else cur.right
+        if not cur:
+            return False
+        if cur.songs.pop(song.id, None) is None:
+            return False
+        self.count -= 1
+        if cur.songs:
+            return True
+
+        if cur.left and cur.right:
+            # Move the in-order successor's payload up, then unlink the successor
+            path.append(cur)
+            succ = cur.right
+            while succ.left:
+                path.append(succ)
+                succ = succ.left
+            cur.key, cur.songs = succ.key, succ.songs
+            cur = succ
+
+        child = cur.left or cur.right
+        if not path:
+            self.root = child
+        elif path[-1].left is cur:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        self.size -= 1
+        self._retrace(path)
+        return True
+
+    def build_from_sorted(self, songs):
+        """Replace the tree with a perfectly balanced one in O(n).
+
+        ``songs`` must already be ordered by ``song_key`` (the lowercased
+        title by default). Songs with the same key end up in the same node.
+        """
+        nodes = []
+        count = 0
+        for song in songs:
+            key = self.song_key(song)
+            if nodes and key == nodes[-1].key:
+                count += nodes[-1].put(song)
+                continue
+            count += 1
+            if nodes and key < nodes[-1].key:
+                raise ValueError("Lagu harus terurut berdasarkan key.")
+            nodes.append(TreeNode(key, song))
+
+        def _build(lo, hi):
+            if lo > hi:
+                return None
+            mid = (lo + hi) // 2
+            node = nodes[mid]
+            node.left = _build(lo, mid - 1)
+            node.right = _build(mid + 1, hi)
+            _update_height(node)
             return node
-        self.root = _insert(self.root, song.title.lower(), song)
+
+        self.root = _build(0, len(nodes) - 1)
+        self.size = len(nodes)
+        self.count = count
+
+    def inorder(self):
+        """Yield the stored songs in key (title) order."""
+        stack = []
+        cur = self.root
+        while stack or cur:
+            while cur:
+                stack.append(cur)
+                cur = cur.left
+            cur = stack.pop()
+            yield from cur.songs.values()
+            cur = cur.right
+
+    def iter_prefix(self, prefix):
+        """Lazily yield songs whose title starts with ``prefix``, in title order.
+
+        The walk seeks to the first key >= prefix in O(log n) and stops at
+        the first key past the prefix, so taking K results costs
+        O(log n + K) no matter how many titles match.
+        """
+        prefix = self.query_key(prefix)
+        for node in self._iter_from(prefix):
+            if not node.key.startswith(prefix):
+                return
+            yield from node.songs.values()
+
+    def iter_range(self, low, high):
+        """Lazily yield songs with ``low <= key <= high`` in key order, in O(log n + k)."""
+        high = self.query_key(high)
+        for node in self._iter_from(self.query_key(low)):
+            if node.key > high:
+                return
+            yield from node.songs.values()
 
     def search(self, title):
-        """Search for a song by title."""
-        key = title.lower()
+        """Search for a song by title (the first one, if several share it)."""
+        node = self._find(self.query_key(title))
+        return node.song if node else None
+
+    def search_all(self, title):
+        """Return every song with the given title."""
+        node = self._find(self.query_key(title))
+        return list(node.songs.values()) if node else []
+
+    def _find(self, key):
         cur = self.root
         while cur:
             if key < cur.key:
@@ -48,5 +264,40 @@ class SongBST:
             elif key > cur.key:
                 cur = cur.right
             else:
-                return cur.song
+                return cur
         return None
+
+    def _iter_from(self, key):
+        """Yield nodes with ``node.key >= key`` in ascending key order."""
+        stack = []
+        cur = self.root
+        while cur:
+            if cur.key >= key:
+                stack.append(cur)
+                cur = cur.left
+            else:
+                cur = cur.right
+        while stack:
+            node = stack.pop()
+            yield node
+            cur = node.right
+            while cur:
+                stack.append(cur)
+                cur = cur.left
+
+    def _retrace(self, path):
+        """Fix heights (and balance) on the path from a changed leaf to the root."""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            if not self.balanced:
+                _update_height(node)
+                continue
+            new_root = _rebalance(node)
+            if new_root is node:
+                continue
+            if i == 0:
+                self.root = new_root
+            elif path[i - 1].left is node:
+                path[i - 1].left = new_root
+            else:
+                path[i - 1].right = new_root
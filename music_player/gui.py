@@ -4,7 +4,7 @@ Contains the graphical user interface for the music player.
 """
 
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog
 
 from .models import Song
 from .controller import MusicPlayerController
@@ -13,10 +13,10 @@ from .controller import MusicPlayerController
 class MusicPlayerGUI:
     """Graphical User Interface for the Music Player."""
     
-    def __init__(self, root):
+    def __init__(self, root, log_path=None):
         self.root = root
         self.root.title("🎧 Pemutar Musik - Struktur Data")
-        self.root.geometry("1100x600")
+        self.root.geometry("1300x600")
         self.root.configure(bg="#fff7ed")  # krem terang
 
         # styling ttk: warna-warni
@@ -48,9 +48,10 @@ class MusicPlayerGUI:
         style.map("Color.TButton",
                   background=[("active", "#16a34a")])
 
-        self.controller = MusicPlayerController()
+        self.controller = MusicPlayerController(log_path=log_path)
 
         self.create_widgets()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def create_widgets(self):
         """Create all GUI widgets."""
@@ -164,8 +165,9 @@ class MusicPlayerGUI:
         search_frame.pack(side="left", padx=(0, 10), pady=(0, 10))
 
         ttk.Label(search_frame, text="Judul:").pack(side="left")
-        self.search_entry = ttk.Entry(search_frame, width=30)
+        self.search_entry = ttk.Combobox(search_frame, width=30)
         self.search_entry.pack(side="left", padx=5)
+        self.search_entry.bind("<KeyRelease>", self.on_search_typed)
         ttk.Button(search_frame, text="Cari",
                    style="Color.TButton",
                    command=self.on_search_song).pack(side="left")
@@ -215,6 +217,15 @@ class MusicPlayerGUI:
         )
         playlist_frame.pack(side="left", fill="both", expand=True)
 
+        playlist_bar = ttk.Frame(playlist_frame, style="Main.TFrame")
+        playlist_bar.pack(fill="x", pady=(0, 5))
+        self.playlist_selector = ttk.Combobox(playlist_bar, width=25, state="readonly")
+        self.playlist_selector.pack(side="left")
+        self.playlist_selector.bind("<<ComboboxSelected>>", self.on_select_playlist)
+        ttk.Button(playlist_bar, text="➕ Playlist Baru",
+                   style="Color.TButton",
+                   command=self.on_create_playlist).pack(side="left", padx=4)
+
         self.playlist_listbox = tk.Listbox(
             playlist_frame,
             width=40,
@@ -229,6 +240,60 @@ class MusicPlayerGUI:
         )
         self.playlist_listbox.pack(fill="both", expand=True)
 
+        # Up-next queue
+        queue_frame = ttk.Labelframe(
+            mid_frame, text="⏳ Antrian", padding=10,
+            style="Card.TLabelframe"
+        )
+        queue_frame.pack(side="left", fill="both", expand=True, padx=(10, 0))
+
+        queue_bar = ttk.Frame(queue_frame, style="Main.TFrame")
+        queue_bar.pack(fill="x", pady=(0, 5))
+        ttk.Button(queue_bar, text="⏭ Berikutnya",
+                   style="Color.TButton",
+                   command=lambda: self.on_queue_song(True)).pack(side="left")
+        ttk.Button(queue_bar, text="➕ Antri",
+                   style="Color.TButton",
+                   command=lambda: self.on_queue_song(False)).pack(side="left", padx=4)
+        ttk.Button(queue_bar, text="🗑",
+                   style="Color.TButton",
+                   command=self.on_remove_from_queue).pack(side="left")
+
+        self.queue_listbox = tk.Listbox(
+            queue_frame,
+            width=30,
+            height=15,
+            bg="#f0fdf4",
+            fg="#0f172a",
+            selectbackground="#bbf7d0",
+            borderwidth=0,
+            highlightthickness=1,
+            highlightbackground="#22c55e",
+            font=("Consolas", 9)
+        )
+        self.queue_listbox.pack(fill="both", expand=True)
+
+        # Recent history
+        history_frame = ttk.Labelframe(
+            mid_frame, text="🕘 Riwayat", padding=10,
+            style="Card.TLabelframe"
+        )
+        history_frame.pack(side="left", fill="both", expand=True, padx=(10, 0))
+
+        self.history_listbox = tk.Listbox(
+            history_frame,
+            width=30,
+            height=15,
+            bg="#f5f3ff",
+            fg="#0f172a",
+            selectbackground="#ddd6fe",
+            borderwidth=0,
+            highlightthickness=1,
+            highlightbackground="#8b5cf6",
+            font=("Consolas", 9)
+        )
+        self.history_listbox.pack(fill="both", expand=True)
+
         # Control buttons
         btn2_frame = ttk.Labelframe(
             f, text="🎛 Kontrol Pemutar", padding=10, style="Card.TLabelframe"
@@ -241,6 +306,12 @@ class MusicPlayerGUI:
         ttk.Button(btn2_frame, text="🗑 dari Playlist",
                    style="Color.TButton",
                    command=self.on_remove_from_playlist).pack(side="left", padx=4)
+        ttk.Button(btn2_frame, text="⬆",
+                   style="Color.TButton",
+                   command=lambda: self.on_move_in_playlist(-1)).pack(side="left", padx=4)
+        ttk.Button(btn2_frame, text="⬇",
+                   style="Color.TButton",
+                   command=lambda: self.on_move_in_playlist(1)).pack(side="left", padx=4)
         ttk.Button(btn2_frame, text="▶ Play dari Library",
                    style="Color.TButton",
                    command=self.on_play_from_library).pack(side="left", padx=4)
@@ -256,6 +327,17 @@ class MusicPlayerGUI:
         ttk.Button(btn2_frame, text="⏭ Next",
                    style="Color.TButton",
                    command=self.on_next).pack(side="left", padx=4)
+        self.shuffle_button = ttk.Button(btn2_frame, text="🔀 Shuffle: Off",
+                                         style="Color.TButton",
+                                         command=self.on_toggle_shuffle)
+        self.shuffle_button.pack(side="left", padx=4)
+        self.radio_button = ttk.Button(btn2_frame, text="📻 Radio: Off",
+                                       style="Color.TButton",
+                                       command=self.on_toggle_radio)
+        self.radio_button.pack(side="left", padx=4)
+        ttk.Button(btn2_frame, text="📊 Statistik",
+                   style="Color.TButton",
+                   command=self.on_show_stats).pack(side="left", padx=4)
 
         self.refresh_library_list()
         self.refresh_user_library_list()
@@ -293,7 +375,9 @@ class MusicPlayerGUI:
             self.user_library_listbox.insert(tk.END, str(song))
 
     def refresh_playlist_list(self):
-        """Refresh the playlist listbox."""
+        """Refresh the playlist selector and listbox."""
+        self.playlist_selector["values"] = self.controller.playlists.names()
+        self.playlist_selector.set(self.controller.playlist.name)
         self.playlist_listbox.delete(0, tk.END)
         for song in self.controller.playlist.to_list():
             self.playlist_listbox.insert(tk.END, str(song))
@@ -304,6 +388,20 @@ class MusicPlayerGUI:
             self.now_playing_var.set(f"▶ {song.title} - {song.artist}")
         else:
             self.now_playing_var.set("🎵 Tidak ada lagu yang diputar.")
+        self.refresh_history_list()
+        self.refresh_queue_list()
+
+    def refresh_queue_list(self):
+        """Refresh the up-next queue listbox."""
+        self.queue_listbox.delete(0, tk.END)
+        for song in self.controller.up_next_songs():
+            self.queue_listbox.insert(tk.END, str(song))
+
+    def refresh_history_list(self):
+        """Refresh the recent history listbox."""
+        self.history_listbox.delete(0, tk.END)
+        for song in self.controller.recent_history(15):
+            self.history_listbox.insert(tk.END, str(song))
 
     # ---------- Admin Events ----------
 
@@ -342,6 +440,7 @@ class MusicPlayerGUI:
             messagebox.showinfo("Sukses", "Lagu berhasil dihapus.")
             self.refresh_library_list()
             self.refresh_playlist_list()
+            self.refresh_queue_list()
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
@@ -353,12 +452,27 @@ class MusicPlayerGUI:
         if not title:
             messagebox.showerror("Error", "Masukkan judul lagu.")
             return
-        song = self.controller.search_song_by_title(title)
-        if song:
-            messagebox.showinfo("Hasil Cari", f"Ditemukan:\n{song}")
+        songs = self.controller.search_songs_by_title(title)
+        if songs:
+            lines = "\n".join(str(s) for s in songs)
+            messagebox.showinfo("Hasil Cari", f"Ditemukan:\n{lines}")
+            return
+        suggestions = self.controller.fuzzy_search(title, limit=5)
+        if suggestions:
+            lines = "\n".join(str(s) for s in suggestions)
+            messagebox.showinfo("Hasil Cari", f"Lagu tidak ditemukan. Mungkin maksud Anda:\n{lines}")
         else:
             messagebox.showinfo("Hasil Cari", "Lagu tidak ditemukan.")
 
+    def on_search_typed(self, event):
+        """Refresh title suggestions while the user types."""
+        prefix = self.search_entry.get().strip()
+        if not prefix:
+            self.search_entry["values"] = []
+            return
+        songs = self.controller.autocomplete_title(prefix)
+        self.search_entry["values"] = [song.title for song in songs]
+
     def on_add_to_playlist(self):
         """Handle add to playlist button click."""
         selection = self.user_library_listbox.curselection()
@@ -375,6 +489,33 @@ class MusicPlayerGUI:
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
+    def on_queue_song(self, play_next):
+        """Handle queue buttons: add the selected library song to the up-next queue."""
+        selection = self.user_library_listbox.curselection()
+        if not selection:
+            messagebox.showerror("Error", "Pilih lagu dari library.")
+            return
+        songs = self.controller.get_all_songs()
+        if selection[0] < len(songs):
+            try:
+                self.controller.queue_song(songs[selection[0]].id, play_next)
+                self.refresh_queue_list()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+
+    def on_remove_from_queue(self):
+        """Handle remove from queue button click."""
+        selection = self.queue_listbox.curselection()
+        if not selection:
+            messagebox.showerror("Error", "Pilih lagu dari antrian.")
+            return
+        songs = list(self.controller.up_next_songs())
+        try:
+            self.controller.remove_from_queue(songs[selection[0]].id)
+            self.refresh_queue_list()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
     def on_remove_from_playlist(self):
         """Handle remove from playlist button click."""
         selection = self.playlist_listbox.curselection()
@@ -382,14 +523,48 @@ class MusicPlayerGUI:
             messagebox.showerror("Error", "Pilih lagu di playlist.")
             return
         index = selection[0]
-        songs = self.controller.playlist.to_list()
-        if index < len(songs):
-            song = songs[index]
-            try:
-                self.controller.remove_from_playlist(song.id)
-                self.refresh_playlist_list()
-            except Exception as e:
-                messagebox.showerror("Error", str(e))
+        try:
+            self.controller.remove_from_playlist_at(index)
+            self.refresh_playlist_list()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def on_create_playlist(self):
+        """Handle new playlist button click."""
+        name = simpledialog.askstring("Playlist Baru", "Nama playlist:", parent=self.root)
+        if not name or not name.strip():
+            return
+        try:
+            self.controller.create_playlist(name.strip())
+            self.controller.select_playlist(name.strip())
+            self.refresh_playlist_list()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def on_select_playlist(self, event):
+        """Handle playlist selector change."""
+        try:
+            self.controller.select_playlist(self.playlist_selector.get())
+            self.refresh_playlist_list()
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def on_move_in_playlist(self, offset):
+        """Handle move up/down in playlist button click."""
+        selection = self.playlist_listbox.curselection()
+        if not selection:
+            messagebox.showerror("Error", "Pilih lagu di playlist.")
+            return
+        index = selection[0]
+        new_index = index + offset
+        if new_index < 0 or new_index >= len(self.controller.playlist):
+            return
+        try:
+            self.controller.move_in_playlist(index, new_index)
+            self.refresh_playlist_list()
+            self.playlist_listbox.selection_set(new_index)
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
 
     def on_play_from_library(self):
         """Handle play from library button click."""
@@ -430,3 +605,42 @@ class MusicPlayerGUI:
         """Handle previous button click."""
         song = self.controller.play_prev()
         self.set_now_playing(song)
+
+    def on_close(self):
+        """Handle window close: write out the listening log, then exit."""
+        try:
+            self.controller.close()
+        except OSError as e:
+            messagebox.showerror("Error", f"Log pemutaran gagal disimpan: {e}")
+        finally:
+            self.root.destroy()
+
+    def on_show_stats(self):
+        """Handle statistics button click."""
+        songs = self.controller.top_songs(5)
+        if not songs:
+            messagebox.showinfo("Statistik", "Belum ada lagu yang diputar.")
+            return
+        lines = ["Lagu terpopuler:"]
+        lines += [f"  {song} - {n}x" for song, n in songs]
+        lines.append("Artist terpopuler:")
+        lines += [f"  {artist} - {n}x" for artist, n in self.controller.top_artists(5)]
+        lines.append("Genre terpopuler:")
+        lines += [f"  {genre} - {n}x" for genre, n in self.controller.top_genres(5)]
+        messagebox.showinfo("Statistik", "\n".join(lines))
+
+    def on_toggle_radio(self):
+        """Handle radio button click."""
+        enabled = not self.controller.radio
+        try:
+            self.controller.set_radio(enabled)
+        except ImportError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self.radio_button.config(text=f"📻 Radio: {'On' if enabled else 'Off'}")
+
+    def on_toggle_shuffle(self):
+        """Handle shuffle button click."""
+        enabled = not self.controller.shuffle
+        self.controller.set_shuffle(enabled)
+        self.shuffle_button.config(text=f"🔀 Shuffle: {'On' if enabled else 'Off'}")
@@ -0,0 +1,245 @@
+"""
+Listening Log
+Contains an append-only, persisted log of play/stop events with
+time-range queries.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from bisect import bisect_left
+
+
+class ListeningLog:
+    """Append-only listening log stored as one line per event.
+
+    Each line is ``<timestamp>\\t<event>\\t<song id as JSON>``. ``log()``
+    only stamps the event and puts it on an in-memory queue, so the caller
+    (the GUI thread) never waits for the disk; a background writer thread
+    writes the queued events in batches, flushes every ``flush_interval``
+    seconds and fsyncs at most every ``fsync_interval`` seconds.
+
+    Timestamps are kept non-decreasing, so the file is sorted by time. A
+    sparse index holds the byte offset of every ``index_every``-th line,
+    which lets ``query(start, end)`` seek close to ``start`` instead of
+    reading the whole file.
+
+    If writing fails (e.g. the disk is full) the writer keeps the error,
+    drops later events and still releases callers waiting in ``flush``;
+    ``flush``, ``query``, ``len()`` and ``close`` then raise it, while
+    ``log`` keeps dropping events without raising.
+    """
+
+    def __init__(self, path, flush_interval=0.5, fsync_interval=5.0, index_every=256):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.index_every = index_every
+
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()       # guards the file and the index
+        self._last_time = 0.0
+        self._error = None                  # first write error of the writer thread
+        self._load_index()
+        self._file = open(path, 'ab')
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="listening-log", daemon=True)
+        self._writer.start()
+
+    # ----- Writing -----
+
+    def log(self, event, song_id):
+        """Record ``event`` ('play' or 'stop') for ``song_id`` without blocking.
+
+        After a write error the event is dropped; the error is raised by
+        ``flush`` and ``close`` instead, so logging never breaks playback.
+        """
+        if self._closed:
+            raise ValueError("Log pemutaran sudah ditutup.")
+        if self._error is None:
+            self._queue.put((time.time(), event, song_id))
+
+    def flush(self):
+        """Block until every event logged so far is written to the file."""
+        if self._closed:
+            self._check_error()
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+        self._check_error()
+
+    def close(self):
+        """Write the remaining events, fsync and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._writer.join()
+        self._check_error()
+
+    def _run(self):
+        last_sync = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                item = ...
+            batch, waiters, stop = [], [], False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif item is not ...:
+                    batch.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            with self._lock:
+                try:
+                    if self._error is None:
+                        if batch:
+                            self._write(batch)
+                            dirty = True
+                        if dirty and (stop or time.monotonic() - last_sync >= self.fsync_interval):
+                            os.fsync(self._file.fileno())
+                            last_sync = time.monotonic()
+                            dirty = False
+                except Exception as exc:
+                    # Keep running so waiters are still released; callers re-raise it
+                    self._error = exc
+                if stop:
+                    try:
+                        self._file.close()
+                    except OSError as exc:
+                        self._error = self._error or exc
+            for done in waiters:
+                done.set()
+            if stop:
+                return
+
+    def _check_error(self):
+        if self._error is not None:
+            raise self._error
+
+    def _write(self, batch):
+        lines = []
+        offset = self._size
+        for timestamp, event, song_id in batch:
+            timestamp = max(timestamp, self._last_time)
+            self._last_time = timestamp
+            line = f"{timestamp:.6f}\t{event}\t{json.dumps(song_id)}\n".encode()
+            if self._count % self.index_every == 0:
+                self._index_times.append(timestamp)
+                self._index_offsets.append(offset)
+            self._count += 1
+            offset += len(line)
+            lines.append(line)
+        self._file.write(b"".join(lines))
+        self._file.flush()
+        self._size = offset
+
+    # ----- Reading -----
+
+    def query(self, start=None, end=None):
+        """Return ``(timestamp, event, song_id)`` records with ``start <= timestamp <= end``."""
+        self.flush()
+        with self._lock:
+            if start is None:
+                offset = 0
+            else:
+                # Last indexed line strictly before start: lines with an
+                # equal timestamp may precede an indexed one
+                i = bisect_left(self._index_times, start) - 1
+                offset = self._index_offsets[i] if i >= 0 else 0
+            size = self._size
+            records = []
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                while f.tell() < size:
+                    record = self._parse(f.readline())
+                    if start is not None and record[0] < start:
+                        continue
+                    if end is not None and record[0] > end:
+                        break
+                    records.append(record)
+        return records
+
+    def __len__(self):
+        self.flush()
+        return self._count
+
+    @staticmethod
+    def _parse(line):
+        timestamp, event, song_id = line.decode().rstrip("\n").split("\t", 2)
+        return float(timestamp), event, json.loads(song_id)
+
+    def _load_index(self):
+        """Scan the existing file once to rebuild the sparse index."""
+        self._index_times = []
+        self._index_offsets = []
+        self._count = 0
+        self._size = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break       # torn write from a crash; cut off below
+                timestamp = float(line.split(b"\t", 1)[0])
+                if self._count % self.index_every == 0:
+                    self._index_times.append(timestamp)
+                    self._index_offsets.append(self._size)
+                self._last_time = max(self._last_time, timestamp)
+                self._count += 1
+                self._size += len(line)
+        if self._size != os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(self._size)
+
+    # ----- Maintenance -----
+
+    def rotate(self):
+        """Move the current log aside and start an empty one; return the archive path.
+
+        The archive is named after the current time; a counter is added when
+        that name is taken, so an existing archive is never overwritten.
+        """
+        self.flush()
+        with self._lock:
+            self._file.close()
+            stamp = f"{self.path}.{time.strftime('%Y%m%d-%H%M%S')}"
+            archive, n = stamp, 0
+            while os.path.exists(archive):
+                n += 1
+                archive = f"{stamp}-{n}"
+            os.replace(self.path, archive)
+            self._file = open(self.path, 'ab')
+            self._index_times, self._index_offsets = [], []
+            self._count = self._size = 0
+        return archive
+
+    def compact(self, before):
+        """Drop every record older than ``before``; return how many were removed."""
+        self.flush()
+        with self._lock:
+            removed = self._count
+            temp = self.path + ".tmp"
+            with open(self.path, 'rb') as src, open(temp, 'wb') as dst:
+                for line in src:
+                    if float(line.split(b"\t", 1)[0]) >= before:
+                        dst.write(line)
+                dst.flush()
+                os.fsync(dst.fileno())
+            self._file.close()
+            os.replace(temp, self.path)
+            self._load_index()
+            self._file = open(self.path, 'ab')
+            removed -= self._count
+        return removed
@@ -1,12 +1,61 @@
 """
 Data Models
-Contains the Song class representing a music track.
+Contains the Song class representing a music track, and the value
+dictionaries used to encode its repeated fields.
 """
 
 
+class ValueDictionary:
+    """Maps each distinct value of a field to a small integer code.
+
+    Codes are handed out in first-seen order and never reused, so a code
+    stays valid for the lifetime of the process.
+    """
+
+    __slots__ = ('codes', 'values')
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        """Return the code of ``value``, assigning a new one if needed."""
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code):
+        """Return the value stored under ``code``."""
+        return self.values[code]
+
+    def lookup(self, value):
+        """Return the code of ``value`` without assigning one (``None`` if unseen)."""
+        return self.codes.get(value)
+
+
+# Shared dictionaries for the repeated Song fields
+ARTISTS = ValueDictionary()
+ALBUMS = ValueDictionary()
+GENRES = ValueDictionary()
+
+
 class Song:
-    """Represents a song with metadata."""
-    
+    """Represents a song with metadata.
+
+    Artist, album and genre are dictionary-encoded: the song stores the
+    integer codes (``artist_id``, ``album_id``, ``genre_id``) and the string
+    attributes decode them on access. Comparing two songs' codes is an
+    integer comparison, and each distinct string is stored only once.
+    """
+
+    __slots__ = ('id', 'title', 'artist_id', 'album_id', 'year', 'genre_id')
+
     def __init__(self, song_id, title, artist, album, year, genre):
         self.id = song_id
         self.title = title
@@ -15,5 +64,29 @@ class Song:
         self.year = year
         self.genre = genre
 
+    @property
+    def artist(self):
+        return ARTISTS.values[self.artist_id]
+
+    @artist.setter
+    def artist(self, value):
+        self.artist_id = ARTISTS.encode(value)
+
+    @property
+    def album(self):
+        return ALBUMS.values[self.album_id]
+
+    @album.setter
+    def album(self, value):
+        self.album_id = ALBUMS.encode(value)
+
+    @property
+    def genre(self):
+        return GENRES.values[self.genre_id]
+
+    @genre.setter
+    def genre(self, value):
+        self.genre_id = GENRES.encode(value)
+
     def __str__(self):
         return f"{self.id} - {self.title} ({self.artist})"
@@ -0,0 +1,153 @@
+"""
+Library Query
+Contains a small query engine that combines filters over the library and
+picks the most selective index to start from.
+"""
+
+import sys
+from itertools import islice
+
+from .models import ALBUMS, GENRES
+from .data_structures.indexes import parse_year
+
+
+class LibraryQuery:
+    """A conjunction of filters over the library (every filter must match).
+
+    Supported filters: ``title`` (exact, case-insensitive), ``artist``,
+    ``album``, ``genre``, ``year``, ``year_min``, ``year_max`` and ``where``
+    (any callable taking a song). The query is planned when it is created:
+    every filter that has an index reports its candidate count cheaply and
+    the smallest candidate set drives the query. The remaining filters are
+    then checked on each candidate, so the result is the intersection of all
+    filters without materializing the larger sets. With no indexed filter
+    the query falls back to scanning the library.
+    """
+
+    def __init__(self, controller, title=None, artist=None, album=None,
+                 genre=None, year=None, year_min=None, year_max=None, where=None):
+        self.controller = controller
+        self.filters = {}
+        if title is not None:
+            self.filters['title'] = title.lower()
+        if artist is not None:
+            self.filters['artist'] = artist
+        if album is not None:
+            self.filters['album'] = album
+            self._album_code = ALBUMS.lookup(album)
+        if genre is not None:
+            self.filters['genre'] = genre
+            self._genre_code = GENRES.lookup(genre)
+        if year is not None:
+            year_min = year_max = int(year)
+        if year_min is not None or year_max is not None:
+            self.filters['year'] = (
+                int(year_min) if year_min is not None else -sys.maxsize,
+                int(year_max) if year_max is not None else sys.maxsize,
+            )
+        self.where = where
+        self.estimates = {}
+        self.access_path = self._plan()
+
+    def __iter__(self):
+        """Lazily yield the matching songs."""
+        driver = self.access_path
+        for song in self._candidates(driver):
+            if self._matches(song, skip=driver):
+                yield song
+
+    def all(self):
+        """Return all matching songs as a list."""
+        return list(self)
+
+    def first(self, limit):
+        """Return at most ``limit`` matching songs."""
+        return list(islice(self, limit))
+
+    def explain(self):
+        """Describe which access path was chosen and why."""
+        lines = [f"access path: {self._describe(self.access_path)}"]
+        for name, estimate in self.estimates.items():
+            lines.append(f"  candidates via {name}: {estimate}")
+        checks = [name for name in self.filters if name != self.access_path]
+        if self.where is not None:
+            checks.append("where")
+        lines.append("filters checked per candidate: " + (", ".join(checks) or "none"))
+        return "\n".join(lines)
+
+    # ----- Planning -----
+
+    def _plan(self):
+        """Estimate every indexed filter and return the cheapest access path."""
+        c = self.controller
+        best, best_count = "scan", len(c.library)
+        self.estimates["scan"] = best_count
+
+        counters = {
+            'title': lambda v: len(c.search_tree.search_all(v)),
+            'artist': c.artists.song_count,
+            'album': lambda v: c.indexes.album.count(self._album_code),
+            'genre': lambda v: c.indexes.genre.count(self._genre_code),
+        }
+        for name, count in counters.items():
+            if name in self.filters:
+                self.estimates[name] = count(self.filters[name])
+                if self.estimates[name] < best_count:
+                    best, best_count = name, self.estimates[name]
+
+        if 'year' in self.filters:
+            # Range counts are O(k), so stop counting once it can't win
+            low, high = self.filters['year']
+            in_range = c.indexes.by_year_range(low, high)
+            count = sum(1 for _ in islice(in_range, best_count + 1))
+            self.estimates['year'] = count if count <= best_count else f">{best_count}"
+            if count < best_count:
+                best = 'year'
+        return best
+
+    def _candidates(self, path):
+        c = self.controller
+        if path == 'title':
+            return iter(c.search_tree.search_all(self.filters['title']))
+        if path == 'artist':
+            return c.songs_by_artist(self.filters['artist'])
+        if path == 'album':
+            return c.songs_by_album(self.filters['album'])
+        if path == 'genre':
+            return c.songs_by_genre(self.filters['genre'])
+        if path == 'year':
+            return c.songs_by_year_range(*self.filters['year'])
+        return iter(c.library)
+
+    def _describe(self, path):
+        if path == "scan":
+            return "full library scan"
+        value = self.filters[path]
+        if path == 'year':
+            low, high = value
+            if low == -sys.maxsize:
+                return f"year index, year <= {high}"
+            if high == sys.maxsize:
+                return f"year index, year >= {low}"
+            return f"year index, {low} <= year <= {high}"
+        return f"{path} index = {value!r}"
+
+    # ----- Filtering -----
+
+    def _matches(self, song, skip=None):
+        for name, value in self.filters.items():
+            if name == skip:
+                continue
+            if name == 'title' and song.title.lower() != value:
+                return False
+            if name == 'artist' and song.artist != value:
+                return False
+            if name == 'album' and song.album_id != self._album_code:
+                return False
+            if name == 'genre' and song.genre_id != self._genre_code:
+                return False
+            if name == 'year':
+                year = parse_year(song.year)
+                if year is None or not value[0] <= year <= value[1]:
+                    return False
+        return self.where is None or self.where(song)
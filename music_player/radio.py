@@ -0,0 +1,124 @@
+"""
+Song Radio
+Contains a radio station that ranks songs by personalized PageRank over
+the similarity graph (NumPy needed).
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the radio needs it
+    np = None
+
+from .data_structures.graph import SongGraph
+
+
+class SongRadio:
+    """Endless "radio" recommendations from a random walk with restart.
+
+    The similarity graph is frozen into a ``CSRGraph`` (``SongGraph.freeze``)
+    that keeps the ``max_degree`` heaviest edges of every song; its
+    ``indptr``/``indices`` buffers are used as NumPy arrays without copying
+    and the weights are normalized per row. Personalized PageRank is then a
+    short power iteration: at every step the walk follows a weighted edge
+    with probability ``1 - restart`` or jumps back to the seed songs. Each
+    step is a single vectorized ``np.bincount`` over the edges, so no Python
+    loop touches individual songs.
+
+    Rankings are cached per seed set; the CSR arrays and the cache are
+    rebuilt when ``SongGraph.version`` changes.
+    """
+
+    def __init__(self, graph: SongGraph, restart=0.15, max_degree=50,
+                 iterations=50, tolerance=1e-6, cache_size=32):
+        if np is None:
+            raise ImportError("NumPy diperlukan untuk SongRadio.")
+        self.graph = graph
+        self.restart = restart
+        self.max_degree = max_degree
+        self.iterations = iterations
+        self.tolerance = tolerance
+        self.cache_size = cache_size
+        self._version = None
+        self._cache = {}
+
+    def station(self, seed_ids, weights=None):
+        """Lazily yield song IDs for a station seeded with ``seed_ids``, best first.
+
+        ``weights`` optionally gives each seed's share of the restarts
+        (e.g. the current song more than older history). The seeds
+        themselves are not yielded.
+        """
+        ids, ranking = self._ranking(tuple(seed_ids), tuple(weights) if weights else None)
+        for i in ranking.tolist():
+            yield ids[i]
+
+    def scores(self, seed_ids, weights=None):
+        """Return the personalized PageRank of every song as ``{song_id: score}``."""
+        self._refresh()
+        rank = self._pagerank(self._restart_vector(seed_ids, weights))
+        return dict(zip(self._ids, rank.tolist()))
+
+    # ----- Internals -----
+
+    def _refresh(self):
+        """Rebuild the CSR arrays if the graph changed since the last build."""
+        if self._version == self.graph.version:
+            return
+        csr = self.graph.freeze(self.max_degree)
+        self._ids = csr.ids
+        self._index = csr.index
+        # Zero-copy views of the frozen graph's array buffers
+        self.indptr = np.frombuffer(csr.indptr, dtype=np.int64)
+        self.indices = np.frombuffer(csr.indices, dtype=np.int32)
+        n = len(self._ids)
+        # Row of every edge, so a step is one bincount over the edges
+        self._edge_rows = np.repeat(np.arange(n), np.diff(self.indptr))
+        data = np.frombuffer(csr.weights, dtype=np.float32).astype(np.float64)
+        row_sums = np.bincount(self._edge_rows, weights=data, minlength=n)
+        self._dangling = row_sums <= 0
+        row_sums[self._dangling] = 1.0
+        self.data = data / row_sums[self._edge_rows]
+        self._cache.clear()
+        self._version = csr.version
+
+    def _restart_vector(self, seed_ids, weights):
+        restart = np.zeros(len(self._ids))
+        for i, sid in enumerate(seed_ids):
+            row = self._index.get(sid)
+            if row is not None:
+                restart[row] += weights[i] if weights else 1.0
+        total = restart.sum()
+        return restart / total if total else restart
+
+    def _pagerank(self, restart):
+        rank = restart.copy()
+        n = len(rank)
+        for _ in range(self.iterations):
+            # Without edges bincount returns int64, which cannot take += float
+            spread = np.bincount(self.indices, weights=self.data * rank[self._edge_rows],
+                                 minlength=n).astype(np.float64, copy=False)
+            # Walks stuck on a song without edges start over at the seeds
+            spread += rank[self._dangling].sum() * restart
+            new_rank = (1 - self.restart) * spread + self.restart * restart
+            converged = np.abs(new_rank - rank).sum() < self.tolerance
+            rank = new_rank
+            if converged:
+                break
+        return rank
+
+    def _ranking(self, seed_ids, weights):
+        self._refresh()
+        key = (seed_ids, weights)
+        cached = self._cache.get(key)
+        if cached is None:
+            rank = self._pagerank(self._restart_vector(seed_ids, weights))
+            for sid in seed_ids:
+                row = self._index.get(sid)
+                if row is not None:
+                    rank[row] = 0.0
+            reachable = np.flatnonzero(rank > 0)
+            ranking = reachable[np.argsort(-rank[reachable], kind='stable')]
+            if len(self._cache) >= self.cache_size:
+                del self._cache[next(iter(self._cache))]
+            cached = self._cache[key] = (self._ids, ranking)
+        return cached
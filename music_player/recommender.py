@@ -0,0 +1,193 @@
+"""
+Vector Recommender
+Contains an optional NumPy engine that finds similar songs by cosine
+similarity over song feature vectors.
+"""
+
+import math
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only this engine needs it
+    np = None
+
+from .models import Song
+from .data_structures.indexes import parse_year
+
+
+class VectorRecommender:
+    """K most similar songs by cosine similarity, computed with NumPy.
+
+    Each song is the feature vector ``[sqrt(wa) * onehot(artist),
+    sqrt(wb) * onehot(album), sqrt(wg) * onehot(genre), sqrt(wy) * (cos t,
+    sin t)]``, where ``t`` maps the release year onto [0, pi]. The one-hot
+    parts are never materialized: the dot product of two songs is
+    ``wa*[same artist] + wb*[same album] + wg*[same genre] +
+    wy*cos(t1 - t2)``, so a query only compares integer code columns
+    against the seed's codes. Seeds are scored one at a time into score
+    buffers allocated once per call, so a batch never builds a
+    (seeds x songs) matrix. The top K come from ``argpartition`` over only
+    the scores that can still make it (see ``_top_k``), without sorting.
+
+    Rows of removed songs are reused by later additions, like in
+    ``ColumnarSongStore``.
+    """
+
+    ARTIST_WEIGHT = 3.0
+    ALBUM_WEIGHT = 2.0
+    GENRE_WEIGHT = 1.0
+    YEAR_WEIGHT = 1.0
+    YEAR_BASE = 1900
+    YEAR_SPAN = 130         # years apart at which the year parts point opposite
+    SAMPLE_STRIDE = 64      # _top_k bounds the K-th best score from every 64th song
+
+    def __init__(self, capacity=1024):
+        if np is None:
+            raise ImportError("NumPy diperlukan untuk VectorRecommender.")
+        self._rows = {}
+        self._ids = []
+        self._free = []
+        self.artist = np.full(capacity, -1, dtype=np.int32)
+        self.album = np.full(capacity, -1, dtype=np.int32)
+        self.genre = np.full(capacity, -1, dtype=np.int32)
+        self.year_cos = np.zeros(capacity, dtype=np.float32)
+        self.year_sin = np.zeros(capacity, dtype=np.float32)
+        self.inv_norm = np.zeros(capacity, dtype=np.float32)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, song_id):
+        return song_id in self._rows
+
+    # ----- Updates -----
+
+    def add_song(self, song: Song):
+        """Add a song's feature vector."""
+        if song.id in self._rows:
+            raise ValueError("ID lagu sudah digunakan.")
+        if self._free:
+            row = self._free.pop()
+            self._ids[row] = song.id
+        else:
+            row = len(self._ids)
+            if row == len(self.artist):
+                self._grow(2 * row)
+            self._ids.append(song.id)
+        self._rows[song.id] = row
+        self._store(row, song)
+
+    def add_songs(self, songs):
+        """Add many songs, growing the arrays once."""
+        songs = list(songs)
+        needed = len(self._ids) + len(songs)
+        if needed > len(self.artist):
+            self._grow(max(needed, 2 * len(self.artist)))
+        for song in songs:
+            self.add_song(song)
+
+    def remove_song(self, song_id):
+        """Remove a song; its row is reused by a later addition."""
+        row = self._rows.pop(song_id, None)
+        if row is None:
+            return False
+        self._ids[row] = None
+        self.artist[row] = self.album[row] = self.genre[row] = -1
+        self.year_cos[row] = self.year_sin[row] = self.inv_norm[row] = 0.0
+        self._free.append(row)
+        return True
+
+    # ----- Queries -----
+
+    def similar(self, song_id, k=10):
+        """Return up to ``k`` ``(song_id, cosine)`` pairs most similar to ``song_id``."""
+        return self.similar_batch([song_id], k)[0]
+
+    def similar_batch(self, song_ids, k=10):
+        """Return the top ``k`` ``(song_id, cosine)`` list for each seed.
+
+        Unknown seed IDs get an empty list.
+        """
+        results = {sid: [] for sid in song_ids}
+        n = len(self._ids)
+        k = min(k, len(self._rows) - 1)
+        known = [sid for sid in results if sid in self._rows]
+        if not known or k <= 0:
+            return [results[sid] for sid in song_ids]
+
+        scores = np.empty(n, dtype=np.float32)
+        product = np.empty(n, dtype=np.float32)
+        mask = np.empty(n, dtype=bool)
+        free = np.fromiter(self._free, dtype=np.intp, count=len(self._free))
+        for sid in known:
+            row = self._rows[sid]
+            self._score(row, scores, product, mask)
+            # Never recommend the seed itself or a free row
+            scores[row] = -np.inf
+            scores[free] = -np.inf
+            top = self._top_k(scores, k)
+            results[sid] = [(self._ids[i], value)
+                            for i, value in zip(top.tolist(), scores[top].tolist())]
+        return [results[sid] for sid in song_ids]
+
+    # ----- Internals -----
+
+    def _score(self, row, scores, product, mask):
+        """Write the cosine of every song with the song at ``row`` into ``scores``, in place."""
+        n = len(scores)
+        w = self.YEAR_WEIGHT * self.inv_norm[row]
+        np.multiply(self.year_cos[:n], w * self.year_cos[row], out=scores)
+        np.multiply(self.year_sin[:n], w * self.year_sin[row], out=product)
+        scores += product
+        for column, weight in ((self.artist, self.ARTIST_WEIGHT),
+                               (self.album, self.ALBUM_WEIGHT),
+                               (self.genre, self.GENRE_WEIGHT)):
+            code = column[row]
+            if code == -1:
+                continue    # a missing album never counts as shared
+            np.equal(column[:n], code, out=mask)
+            np.add(scores, weight * self.inv_norm[row], out=scores, where=mask)
+        scores *= self.inv_norm[:n]
+
+    def _top_k(self, scores, k):
+        """Return the indices of the ``k`` highest ``scores``, best first.
+
+        The K-th best of a strided sample is a lower bound for the K-th best
+        overall, so only the few scores at or above it are partitioned.
+        """
+        sample = scores[::self.SAMPLE_STRIDE]
+        if len(sample) > k:
+            bound = np.partition(sample, len(sample) - k)[len(sample) - k]
+            candidates = np.flatnonzero(scores >= bound)
+        else:
+            candidates = np.arange(len(scores))
+        values = scores[candidates]
+        top = np.argpartition(values, len(values) - k)[len(values) - k:]
+        top = top[np.argsort(-values[top], kind='stable')]
+        return candidates[top]
+
+    def _store(self, row, song: Song):
+        squared_norm = self.ARTIST_WEIGHT + self.GENRE_WEIGHT
+        self.artist[row] = song.artist_id
+        self.genre[row] = song.genre_id
+        if song.album:
+            self.album[row] = song.album_id
+            squared_norm += self.ALBUM_WEIGHT
+        else:
+            self.album[row] = -1
+        year = parse_year(song.year)
+        if year is None:
+            self.year_cos[row] = self.year_sin[row] = 0.0
+        else:
+            t = min(max((year - self.YEAR_BASE) / self.YEAR_SPAN, 0.0), 1.0) * math.pi
+            self.year_cos[row] = math.cos(t)
+            self.year_sin[row] = math.sin(t)
+            squared_norm += self.YEAR_WEIGHT
+        self.inv_norm[row] = 1.0 / math.sqrt(squared_norm)
+
+    def _grow(self, capacity):
+        for name in ('artist', 'album', 'genre', 'year_cos', 'year_sin', 'inv_norm'):
+            old = getattr(self, name)
+            new = np.full(capacity, -1 if old.dtype == np.int32 else 0, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
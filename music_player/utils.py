@@ -1,7 +1,27 @@
 """
 Utility Functions
-Contains helper functions for the music player (if needed in the future).
+Contains helper functions for the music player.
 """
 
-# This file is reserved for future utility functions
-pass
+
+def prefix_edit_similarity(query, word):
+    """Return a 0..1 edit-distance similarity between ``query`` and ``word``.
+
+    The score is the best one over ``word`` and all of its prefixes, so
+    partial words ("bohem") match as well as full ones. One
+    dynamic-programming pass over ``word`` yields every prefix distance.
+    """
+    prev = list(range(len(query) + 1))
+    best = 0.0 if query else 1.0
+    for i, cw in enumerate(word, 1):
+        cur = [i]
+        for j, cq in enumerate(query, 1):
+            cur.append(min(prev[j] + 1,
+                           cur[j - 1] + 1,
+                           prev[j - 1] + (cw != cq)))
+        best = max(best, 1.0 - cur[-1] / max(i, len(query)))
+        # Longer prefixes are at least i - len(query) edits away
+        if i > len(query) and 1.0 - (i - len(query)) / i <= best:
+            break
+        prev = cur
+    return best